@@ -0,0 +1,77 @@
+import weakref
+import pygame
+
+ALPHA_LEVELS = 32  # Number of distinct alpha steps between transparent and opaque
+
+
+# --- Alpha variant cache: faded copies of shared surfaces at quantized alpha levels ---
+class AlphaCache:
+    def __init__(self, levels=ALPHA_LEVELS):
+        self.levels = levels
+        # Source surface -> {level: faded surface}. Weak keys, so variants go
+        # away with their source (e.g. a string evicted from the text cache)
+        self.variants = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def level(self, alpha):
+        alpha = max(0, min(255, int(alpha)))
+        return round(alpha * (self.levels - 1) / 255)
+
+    def get(self, surface, alpha):
+        # Returns `surface` faded to `alpha`, or None when it would be invisible.
+        # The result is shared: never draw on it or change its alpha.
+        level = self.level(alpha)
+        if level == 0:
+            return None
+        if level == self.levels - 1:
+            return surface
+        variants = self.variants.get(surface)
+        if variants is None:
+            variants = self.variants[surface] = {}
+        faded = variants.get(level)
+        if faded is not None:
+            self.hits += 1
+            return faded
+        self.misses += 1
+        faded = variants[level] = self._fade(surface, level)
+        return faded
+
+    def prebuild(self, surface):
+        # Builds every level up front so the first fade doesn't allocate
+        for level in range(1, self.levels - 1):
+            self.get(surface, level * 255 / (self.levels - 1))
+
+    def _fade(self, surface, level):
+        faded = surface.copy()
+        alpha = round(level * 255 / (self.levels - 1))
+        if faded.get_flags() & pygame.SRCALPHA:
+            # Scale the per-pixel alpha, like set_alpha does at blit time
+            faded.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+        else:
+            faded.set_alpha(alpha)
+        return faded
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'sources': len(self.variants),
+            'variants': sum(len(variants) for variants in self.variants.values()),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared instance used by every fade path
+alpha_cache = AlphaCache()
+
+
+def faded(surface, alpha):
+    return alpha_cache.get(surface, alpha)
+
+
+def format_stats():
+    stats = alpha_cache.stats()
+    return (f"Fades: {stats['variants']} variants of {stats['sources']} surfaces, "
+            f"{stats['hit_rate']:.1%} hit rate ({stats['misses']} built)")
@@ -0,0 +1,82 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pygame
+from asset_registry import registry
+from text_cache import render_text
+from render_scale import world_width, world_height, world_size, draw_rect, present
+
+LOADER_WORKERS = 4
+
+
+# --- Startup loader: fills the asset registry on a worker pool behind a progress screen ---
+class AssetLoader:
+    def __init__(self, specs, workers=LOADER_WORKERS):
+        # Only load what the registry doesn't have yet (a restart finds everything cached)
+        self.specs = [spec for spec in specs if not registry.contains(*spec)]
+        self.workers = workers
+        self.timings = []  # (seconds, spec)
+        self.errors = []  # (spec, exception)
+        self.loaded = 0
+
+    def _load(self, spec):
+        start = time.perf_counter()
+        registry.get_image(*spec)
+        return time.perf_counter() - start
+
+    def run(self, screen=None):
+        # Loads every spec, drawing the progress screen on `screen` as assets
+        # complete. Returns the wall-clock time spent.
+        start = time.perf_counter()
+        if not self.specs:
+            return 0.0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._load, spec): spec for spec in self.specs}
+            for future in as_completed(futures):
+                spec = futures[future]
+                try:
+                    self.timings.append((future.result(), spec))
+                except Exception as e:
+                    # The entity that needs this asset reports its own fallback later
+                    self.errors.append((spec, e))
+                self.loaded += 1
+                if screen is not None:
+                    pygame.event.pump()  # Keep the window responsive
+                    draw_loading_screen(screen, self.loaded, len(self.specs))
+                    present(screen)
+        return time.perf_counter() - start
+
+    def report(self, wall_time, top=None):
+        # Prints the per-asset timing breakdown, slowest first: every asset,
+        # or only the `top` slowest
+        total = sum(seconds for seconds, _ in self.timings)
+        print(f"Loaded {len(self.timings)} assets in {wall_time * 1000:.1f} ms "
+              f"({total * 1000:.1f} ms of work on {self.workers} workers)")
+        for seconds, (path, size, scale, smooth) in sorted(self.timings, reverse=True)[:top]:
+            variant = f" {size[0]}x{size[1]}" if size else (f" x{scale}" if scale else "")
+            print(f"  {seconds * 1000:7.2f} ms  {path}{variant}")
+        for (path, _, _, _), error in self.errors:
+            print(f"  failed      {path}: {error}")
+
+
+def draw_loading_screen(screen, loaded, total):
+    width, height = world_size(screen)
+    screen.fill((0, 0, 0))
+    # Progress bar
+    bar_w, bar_h = width // 3, 24
+    bar_x = (width - bar_w) // 2
+    bar_y = height // 2
+    fill = int(bar_w * (loaded / total)) if total else bar_w
+    draw_rect(screen, (40, 40, 40), (bar_x, bar_y, bar_w, bar_h))
+    draw_rect(screen, (255, 255, 200), (bar_x, bar_y, fill, bar_h))
+    draw_rect(screen, (180, 180, 180), (bar_x, bar_y, bar_w, bar_h), 2)
+    # Label
+    text = render_text(f"Loading... {loaded}/{total}", 36, (220, 220, 220))
+    screen.blit(text, (width // 2 - world_width(text) // 2, bar_y - world_height(text) - 12))
+
+
+def load_assets(specs, screen=None):
+    loader = AssetLoader(specs)
+    wall_time = loader.run(screen)
+    if loader.timings or loader.errors:
+        loader.report(wall_time)
+    return loader
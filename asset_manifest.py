@@ -0,0 +1,62 @@
+import os
+from asset_registry import native_size
+from background import BACKGROUND_DIR, layer_files
+from effects import master_cum_size
+from enemies import ENEMY_SIZE, ENEMY_FRAME_SETS, enemy_frame_paths
+from player import PLAYER_SIZE, player_frame_paths
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+def asset_specs():
+    # Every image the game requests from the asset registry, as the
+    # (path, size, scale, smooth) keys the registry uses. Anything missing
+    # from this list still works; it is just decoded from PNG on first use.
+    specs = []
+
+    def add(paths, size=None, scale=None, smooth=False):
+        for path in paths:
+            specs.append((path, size, scale, smooth))
+
+    # Background layers
+    add(layer_files(BACKGROUND_DIR), size=(SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    # Player
+    for paths in player_frame_paths().values():
+        add(paths, size=PLAYER_SIZE)
+
+    # Enemies
+    for name, frame_set in ENEMY_FRAME_SETS.items():
+        left_paths, right_paths, dead_path = enemy_frame_paths(name, *frame_set)
+        add(left_paths + right_paths + [dead_path], size=ENEMY_SIZE)
+
+    # Potions
+    add([os.path.join('assets', 'effects', 'health_potion', f'hpot_{i}.png') for i in range(1, 5)], size=(40, 40))
+    add([os.path.join('assets', 'effects', 'mana_potion', f'manapot_{i}.png') for i in range(1, 5)], size=(40, 40))
+
+    # Milky grenade
+    add(['assets/effects/grenade/granada_left.png', 'assets/effects/grenade/granada_right.png'], scale=1.5)
+    add([f'assets/effects/grenade/explosao_{i}.png' for i in range(1, 5)], scale=2.0)
+
+    # HUD skill icons
+    add(['assets/effects/grenade/granada_ready.png',
+         'assets/effects/grenade/grenade_not_ready.png',
+         'assets/effects/ultimate_hud/ult_ready_hud.png',
+         'assets/effects/ultimate_hud/ult_not_ready_hud.png'], size=(100, 100))
+
+    # Effects
+    add([os.path.join('assets', 'effects', 'text_effects', 'milky.png')], size=(150, 150))
+    ult_hud_dir = os.path.join('assets', 'effects', 'ultimate_hud')
+    add([os.path.join(ult_hud_dir, 'ult_ready_hud.png'), os.path.join(ult_hud_dir, 'ult_not_ready_hud.png')], size=(200, 200))
+    master_cum_path = os.path.join('assets', 'effects', 'text_effects', 'master_cum.png')
+    add([master_cum_path], size=master_cum_size(native_size(master_cum_path)))
+    ult_anim_dir = os.path.join('assets', 'effects', 'ultimate_animation')
+    add([os.path.join(ult_anim_dir, f'ult_right_{i}.png') for i in range(1, 5)], scale=2)
+    add([os.path.join(ult_anim_dir, f'ult_left_{i}.png') for i in range(1, 5)], scale=2)
+    popup_path = os.path.join(ult_anim_dir, 'ult_popup.png')
+    if os.path.exists(popup_path):
+        add([popup_path])
+
+    # Menu logo
+    add([os.path.join('assets', 'logo', 'logo.png')], size=(400, 200), smooth=True)
+
+    return specs
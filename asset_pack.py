@@ -0,0 +1,175 @@
+"""
+Prebaked asset pack.
+
+Stores every image from the asset manifest already decoded and scaled, as raw
+RGBA pixels, for one or more target resolutions. The game memory-maps the pack
+and builds surfaces straight from its bytes, so a cold start does not decode
+any PNG. Run this module to build or refresh the pack:
+
+    python asset_pack.py --resolution 1920x1080 --resolution 1280x720
+
+Entries whose source file is unchanged (by content hash) are copied from the
+previous pack instead of being decoded again.
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import pygame
+from render_scale import RENDER_SIZE
+
+ASSET_PACK_PATH = os.path.join('assets', 'assets.pack')
+
+MAGIC = b'PSVPACK1'
+HEADER = struct.Struct('<8sQ')  # magic, index length
+PIXEL_FORMAT = 'RGBA'
+
+
+def pack_key(spec):
+    # JSON-friendly key for a (path, size, scale, smooth) registry key
+    path, size, scale, smooth = spec
+    return json.dumps([path.replace(os.sep, '/'), list(size) if size else None, scale, smooth])
+
+
+def resolution_name(resolution):
+    return f'{resolution[0]}x{resolution[1]}'
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class AssetPack:
+    def __init__(self, path=ASSET_PACK_PATH):
+        self.path = path
+        self.file = open(path, 'rb')
+        # The map stays open for the lifetime of the pack: surfaces built by
+        # get() read their pixels straight from it until they are converted
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_length = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an asset pack")
+        self.index = json.loads(self.data[HEADER.size:HEADER.size + index_length])
+        self.data_start = HEADER.size + index_length
+
+    @staticmethod
+    def open(path=ASSET_PACK_PATH):
+        # Returns None when there is no usable pack, so callers can fall back to PNGs
+        if not os.path.exists(path):
+            return None
+        try:
+            return AssetPack(path)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring asset pack {path}: {e}")
+            return None
+
+    def resolutions(self):
+        return list(self.index['variants'])
+
+    def entry(self, spec, resolution):
+        variant = self.index['variants'].get(resolution_name(resolution))
+        if variant is None:
+            return None
+        return variant.get(pack_key(spec))
+
+    def raw_bytes(self, entry):
+        start = self.data_start + entry['offset']
+        return self.data[start:start + entry['length']]
+
+    def get(self, spec, resolution):
+        # Returns an unconverted surface that shares memory with the map, or None
+        entry = self.entry(spec, resolution)
+        if entry is None:
+            return None
+        start = self.data_start + entry['offset']
+        pixels = memoryview(self.data)[start:start + entry['length']]
+        return pygame.image.frombuffer(pixels, tuple(entry['size']), PIXEL_FORMAT)
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+
+def build_pack(specs, resolutions, path=ASSET_PACK_PATH):
+    # Writes a pack holding every spec for every resolution. Resolutions
+    # already present in the old pack are kept and refreshed as well.
+    old_pack = AssetPack.open(path)
+    resolutions = list(resolutions)
+    if old_pack is not None:
+        for name in old_pack.resolutions():
+            width, height = (int(v) for v in name.split('x'))
+            if (width, height) not in resolutions:
+                resolutions.append((width, height))
+
+    from asset_registry import decode_image
+    hashes = {}
+    index = {'format': PIXEL_FORMAT, 'variants': {}}
+    blobs = []
+    offset = 0
+    rebuilt = reused = 0
+    for resolution in resolutions:
+        variant = index['variants'].setdefault(resolution_name(resolution), {})
+        for spec in specs:
+            source = spec[0]
+            if source not in hashes:
+                hashes[source] = file_hash(source)
+            old_entry = old_pack.entry(spec, resolution) if old_pack is not None else None
+            if old_entry is not None and old_entry['hash'] == hashes[source]:
+                pixels = old_pack.raw_bytes(old_entry)
+                size = tuple(old_entry['size'])
+                reused += 1
+            else:
+                image = decode_image(*spec, resolution=resolution)
+                pixels = pygame.image.tostring(image, PIXEL_FORMAT)
+                size = image.get_size()
+                rebuilt += 1
+            variant[pack_key(spec)] = {
+                'offset': offset,
+                'length': len(pixels),
+                'size': list(size),
+                'hash': hashes[source],
+            }
+            blobs.append(pixels)
+            offset += len(pixels)
+
+    index_bytes = json.dumps(index).encode('utf-8')
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for pixels in blobs:
+            f.write(pixels)
+    if old_pack is not None:
+        old_pack.close()
+    os.replace(temp_path, path)
+    return rebuilt, reused
+
+
+def parse_resolution(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the prebaked asset pack")
+    parser.add_argument('--resolution', action='append', type=parse_resolution,
+                        help="target resolution as WIDTHxHEIGHT (repeatable, default: the render resolution)")
+    parser.add_argument('--output', default=ASSET_PACK_PATH)
+    args = parser.parse_args()
+
+    # A hidden display is enough for convert_alpha during the build
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    from asset_manifest import asset_specs
+    resolutions = args.resolution or [RENDER_SIZE]
+    rebuilt, reused = build_pack(asset_specs(), resolutions, args.output)
+    print(f"Wrote {args.output}: {rebuilt} entries rebuilt, {reused} reused")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import struct
+import threading
+import pygame
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from render_scale import RENDER_SIZE
+
+
+def scale_to_resolution(size, resolution):
+    # Sizes are authored for SCREEN_WIDTH x SCREEN_HEIGHT; other resolutions
+    # get proportionally scaled variants
+    if resolution is None or resolution == (SCREEN_WIDTH, SCREEN_HEIGHT):
+        return size
+    return (max(1, round(size[0] * resolution[0] / SCREEN_WIDTH)),
+            max(1, round(size[1] * resolution[1] / SCREEN_HEIGHT)))
+
+
+def native_size(path):
+    # Reads the pixel size from the PNG header without decoding the image
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if header[:8] != b'\x89PNG\r\n\x1a\n':
+        return pygame.image.load(path).get_size()
+    return struct.unpack('>II', header[16:24])
+
+
+def decode_image(path, size=None, scale=None, smooth=False, resolution=None):
+    # Loads a PNG from disk and scales it; this is the slow path the registry
+    # and the asset pack builder both share
+    image = pygame.image.load(path)
+    if pygame.display.get_surface() is not None:
+        image = image.convert_alpha()
+    if scale is not None:
+        size = (int(image.get_width() * scale), int(image.get_height() * scale))
+    if size is None:
+        size = image.get_size()
+    size = scale_to_resolution(size, resolution)
+    if size != image.get_size():
+        resize = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        image = resize(image, size)
+    return image
+
+
+# --- Process-wide asset registry: every surface is loaded, converted and scaled once ---
+class AssetRegistry:
+    def __init__(self):
+        self.images = {}  # (path, size, scale, smooth) -> converted surface
+        self.pack = None  # Optional prebaked AssetPack
+        self.resolution = RENDER_SIZE  # Assets are prepared at the internal render resolution
+        self.hits = 0
+        self.misses = 0
+        self.pack_loads = 0  # Misses served from the asset pack
+        self.decodes = 0  # Misses that had to decode a PNG
+        self.lock = threading.Lock()  # Misses can be served from loader worker threads
+
+    def use_pack(self, pack):
+        # Closes the pack it replaces (use_pack(None) on quit). Its surfaces
+        # were converted on load, so nothing still reads from its map.
+        if self.pack is not None and self.pack is not pack:
+            self.pack.close()
+        self.pack = pack
+
+    def get_image(self, path, size=None, scale=None, smooth=False):
+        # Returns a shared surface. Callers must treat it as read-only:
+        # copy() it before drawing on it or changing its alpha.
+        key = (path, size, scale, smooth)
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+        with self.lock:
+            self.misses += 1
+        image = self._load(key)
+        with self.lock:
+            # Another thread may have loaded the same key meanwhile; keep the first
+            return self.images.setdefault(key, image)
+
+    def contains(self, path, size=None, scale=None, smooth=False):
+        return (path, size, scale, smooth) in self.images
+
+    def get_frames(self, paths, size=None, scale=None, smooth=False):
+        return [self.get_image(path, size, scale, smooth) for path in paths]
+
+    def _load(self, key):
+        if self.pack is not None:
+            image = self.pack.get(key, self.resolution)
+            if image is not None:
+                with self.lock:
+                    self.pack_loads += 1
+                if pygame.display.get_surface() is not None:
+                    image = image.convert_alpha()
+                return image
+        with self.lock:
+            self.decodes += 1
+        return decode_image(*key, resolution=self.resolution)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.images),
+            'hits': self.hits,
+            'misses': self.misses,
+            'pack_loads': self.pack_loads,
+            'decodes': self.decodes,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.pack_loads = 0
+        self.decodes = 0
+
+    def clear(self):
+        self.images.clear()
+        self.reset_stats()
+
+
+# Shared instance used by every entity, effect and HUD element
+registry = AssetRegistry()
+
+
+def get_image(path, size=None, scale=None, smooth=False):
+    return registry.get_image(path, size, scale, smooth)
+
+
+def get_frames(paths, size=None, scale=None, smooth=False):
+    return registry.get_frames(paths, size, scale, smooth)
+
+
+def format_stats():
+    stats = registry.stats()
+    return (f"Assets: {stats['entries']} cached, {stats['hits']} hits, "
+            f"{stats['misses']} misses ({stats['pack_loads']} from pack, {stats['decodes']} decoded, "
+            f"{stats['hit_rate']:.1%} hit rate)")
@@ -0,0 +1,49 @@
+"""
+Offline audio build step.
+
+Decodes every sound effect in game_sounds.SOUND_EFFECTS once and writes it as
+raw PCM in the mixer's native format, so the game can hand the bytes straight
+to the mixer instead of decoding MP3s at startup:
+
+    python audio_build.py --preset low_latency
+
+A blob is only valid for the exact mixer format (frequency, sample size,
+channels) it was built for, which is part of its file name. Blobs newer than
+their source file are left alone.
+"""
+import argparse
+import os
+from settings import AUDIO_PRESETS, AUDIO_PRESET
+
+
+def build_sounds(preset=AUDIO_PRESET, force=False):
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')  # No audio device needed
+    import pygame
+    from game_sounds import init_mixer, baked_sound_path, SOUND_EFFECTS, BAKED_SOUNDS_DIR
+
+    init_mixer(preset)
+    os.makedirs(BAKED_SOUNDS_DIR, exist_ok=True)
+    built = skipped = 0
+    for name, (path, _, _) in SOUND_EFFECTS.items():
+        baked_path = baked_sound_path(name)
+        if not force and os.path.exists(baked_path) and os.path.getmtime(baked_path) >= os.path.getmtime(path):
+            skipped += 1
+            continue
+        raw = pygame.mixer.Sound(path).get_raw()
+        with open(baked_path, 'wb') as f:
+            f.write(raw)
+        built += 1
+    return built, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-decode sound effects to raw PCM")
+    parser.add_argument('--preset', default=AUDIO_PRESET, choices=sorted(AUDIO_PRESETS))
+    parser.add_argument('--force', action='store_true', help="rebuild even if blobs are up to date")
+    args = parser.parse_args()
+    built, skipped = build_sounds(args.preset, args.force)
+    print(f"Baked {built} sound effects ({skipped} up to date)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,72 @@
 import os
 import pygame
 from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from asset_registry import get_image
+
+BACKGROUND_DIR = os.path.join('assets', 'background', 'jungle')
+
+
+def layer_files(background_dir):
+    # Layer images in drawing order (back to front)
+    return [os.path.join(background_dir, file) for file in sorted(os.listdir(background_dir))
+            if file.lower().endswith(('.png', '.jpg', '.jpeg'))]
+
+
+def is_opaque(surface):
+    # True when every pixel is fully opaque (the layer hides everything behind it)
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return True
+    width, height = surface.get_size()
+    return pygame.mask.from_surface(surface, 254).count() == width * height
+
+
+def make_strip(surface, opaque):
+    # Two copies side by side, so any scroll offset is one contiguous area.
+    # Opaque strips use a format without alpha, which blits much faster.
+    width, height = surface.get_size()
+    if opaque:
+        strip = pygame.Surface((width * 2, height))
+    else:
+        strip = pygame.Surface((width * 2, height), pygame.SRCALPHA)
+    strip.blit(surface, (0, 0))
+    strip.blit(surface, (width, 0))
+    if pygame.display.get_surface() is not None:
+        strip = strip.convert() if opaque else strip.convert_alpha()
+    return strip
+
 
 class ParallaxBackground:
     def __init__(self, background_dir):
-        self.layers = self.load_layers(background_dir)
-        self.speeds = [0.2 + 0.3 * i for i in range(len(self.layers))]
+        images = self.load_layers(background_dir)
+        speeds = [0.2 + 0.3 * i for i in range(len(images))]
+        # One entry per drawn layer: pre-stitched strip, speed, scroll offset
+        self.layers, self.speeds = self.composite_layers(images, speeds)
         self.offsets = [0.0 for _ in self.layers]
 
     def load_layers(self, background_dir):
+        return [get_image(path, size=(SCREEN_WIDTH, SCREEN_HEIGHT)) for path in layer_files(background_dir)]
+
+    def composite_layers(self, images, speeds):
+        # Layers under the topmost fully opaque layer are never visible
+        opaque = [is_opaque(image) for image in images]
+        first = max((i for i, is_full in enumerate(opaque) if is_full), default=0)
+        # Consecutive layers that scroll at the same speed are merged into one
+        groups = []
+        for image, speed, is_full in zip(images[first:], speeds[first:], opaque[first:]):
+            if groups and groups[-1][1] == speed:
+                groups[-1][0].append(image)
+                groups[-1][2] = groups[-1][2] or is_full
+            else:
+                groups.append([[image], speed, is_full])
         layers = []
-        for file in sorted(os.listdir(background_dir)):
-            if file.lower().endswith(('.png', '.jpg', '.jpeg')):
-                img = pygame.image.load(os.path.join(background_dir, file)).convert_alpha()
-                img = pygame.transform.scale(img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                layers.append(img)
-        return layers
+        for group_images, speed, group_opaque in groups:
+            merged = group_images[0]
+            if len(group_images) > 1:
+                merged = group_images[0].copy()
+                for image in group_images[1:]:
+                    merged.blit(image, (0, 0))
+            layers.append(make_strip(merged, group_opaque))
+        return layers, [speed for _, speed, _ in groups]
 
     def update(self):
         for i in range(len(self.layers)):
@@ -24,7 +75,9 @@ class ParallaxBackground:
                 self.offsets[i] += SCREEN_WIDTH
 
     def draw(self, surface):
-        for i, layer in enumerate(self.layers):
-            x = int(self.offsets[i])
-            surface.blit(layer, (x, 0))
-            surface.blit(layer, (x + SCREEN_WIDTH, 0))
\ No newline at end of file
+        # One area blit per layer out of its wraparound strip. Offsets are in
+        # world units; strips are at the render resolution.
+        for i, strip in enumerate(self.layers):
+            width = strip.get_width() // 2
+            x = -int(self.offsets[i]) * width // SCREEN_WIDTH
+            surface.blit(strip, (0, 0), (x, 0, width, strip.get_height()))
@@ -0,0 +1,115 @@
+from collections import namedtuple
+from enemies import FatGirlEnemy, WolfEnemy, BlueBirdEnemy, RedBirdEnemy
+from health_potion import HealthPotion
+from mana_potion import ManaPotion
+from game_sounds import GameSounds
+from lifecycle import potion_lifecycle
+from pool import acquire
+from replay import rng
+
+# Damage sources
+MELEE = 'melee'
+GRENADE = 'grenade'
+ULTIMATE = 'ultimate'
+
+MELEE_DAMAGE = (1, 5)  # Random roll; the top roll is a critical hit
+GRENADE_DAMAGE = (10, 40)  # At the edge / at the center of the explosion
+ULTIMATE_DAMAGE = 50  # Fatal damage for enemies within range
+
+# What killing each enemy type gives: mana for the player, and the item it
+# drops (with the chance of dropping it)
+Reward = namedtuple('Reward', 'mana drop drop_chance')
+KILL_REWARDS = {
+    WolfEnemy: Reward(10, None, 0.0),
+    FatGirlEnemy: Reward(12, None, 0.0),
+    BlueBirdEnemy: Reward(0, ManaPotion, 1.0),  # Blue birds drop mana potions
+    RedBirdEnemy: Reward(0, HealthPotion, 1.0),  # Red birds drop health potions
+}
+NO_REWARD = Reward(0, None, 0.0)
+
+
+def grenade_damage(grenade, enemy):
+    # Maximum damage at the center of the explosion, decreasing with distance
+    enemy_width = getattr(enemy, 'width', 180)  # Default to ENEMY_SIZE[0]
+    enemy_height = getattr(enemy, 'height', 180)  # Default to ENEMY_SIZE[1]
+    dx = (enemy.x + enemy_width/2) - (grenade.x)
+    dy = (enemy.y + enemy_height/2) - (grenade.y)
+    distance = (dx**2 + dy**2)**0.5
+    min_damage, max_damage = GRENADE_DAMAGE
+    damage_factor = max(0, 1 - distance / grenade.explosion_radius)
+    return int(min_damage + damage_factor * (max_damage - min_damage))
+
+
+# --- Combat stage: attacks emit damage events, resolved together once per frame ---
+class CombatStage:
+    def __init__(self):
+        self.events = []  # (enemy, source, damage or None to roll) for this frame
+        # Counters over the session
+        self.frames = 0
+        self.total_events = 0
+        self.crits = 0
+        self.kills = 0
+
+    def hit(self, enemy, source, damage=None):
+        self.events.append((enemy, source, damage))
+
+    def resolve(self, player, effects, kills):
+        # One pass over the frame's events, in emission order: damage, critical
+        # hits, kills, rewards and drops. Enemies killed by an earlier event
+        # ignore the rest.
+        for enemy, source, damage in self.events:
+            if enemy.state == 'dead':
+                continue
+            if source == MELEE:
+                damage = self._melee_damage(player, effects)
+            enemy.take_damage(damage)  # Adds the damage popup
+            if enemy.state == 'dead':
+                self._reward(enemy, player, kills)
+        self.total_events += len(self.events)
+        self.events.clear()
+        self.frames += 1
+
+    def _melee_damage(self, player, effects):
+        min_dmg, max_dmg = MELEE_DAMAGE
+        dmg = rng.randint(min_dmg, max_dmg)
+        if dmg == max_dmg:
+            GameSounds.play_milky_effect()
+            player_position = (player.x + 90, player.y)
+            effects.add_milky_effect(duration=60, player_position=player_position)
+            dmg += rng.randint(min_dmg, max_dmg)
+            # Heal the player with the same value as the critical damage
+            player.heal(dmg)
+            self.crits += 1
+        return dmg
+
+    def _reward(self, enemy, player, kills):
+        # Swarm views (swarm.SwarmEnemy) name the class they stand in for
+        reward = KILL_REWARDS.get(getattr(enemy, 'enemy_class', type(enemy)), NO_REWARD)
+        kills[0] += 1
+        self.kills += 1
+        if reward.mana:
+            player.mana = min(player.max_mana, player.mana + reward.mana)
+        if reward.drop and rng.random() <= reward.drop_chance:
+            # Dropped at the center of the enemy
+            potion_lifecycle.spawn(acquire(reward.drop, enemy.x + 70, enemy.y + 70))
+
+    def clear(self):
+        self.events.clear()
+
+    def stats(self):
+        frames = self.frames or 1
+        return {
+            'events_per_frame': self.total_events / frames,
+            'crits': self.crits,
+            'kills': self.kills,
+        }
+
+
+# Shared instance used by update_game
+combat = CombatStage()
+
+
+def format_stats():
+    stats = combat.stats()
+    return (f"Combat: {stats['events_per_frame']:.2f} damage events per frame, "
+            f"{stats['kills']} kills, {stats['crits']} critical hits")
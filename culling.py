@@ -0,0 +1,56 @@
+import pygame
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from render_scale import world_size
+
+
+# --- Viewport culling: anything outside the screen is skipped before it is drawn ---
+class Viewport:
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)  # World units
+        # Counters: this frame and totals
+        self.drawn = 0
+        self.culled = 0
+        self.frames = 0
+        self.total_drawn = 0
+        self.total_culled = 0
+
+    def begin_frame(self):
+        self.frames += 1
+        self.drawn = 0
+        self.culled = 0
+
+    def visible(self, rect):
+        # Drawing test: counts the drawable as drawn or culled
+        if self.rect.colliderect(rect):
+            self.drawn += 1
+            self.total_drawn += 1
+            return True
+        self.culled += 1
+        self.total_culled += 1
+        return False
+
+    def visible_at(self, image, position):
+        # Drawing test for a single image drawn at `position`
+        return self.visible(pygame.Rect(position, world_size(image)))
+
+    def contains(self, rect):
+        # Same test without counting, for skipping other per-frame work
+        return self.rect.colliderect(rect)
+
+    def stats(self):
+        frames = self.frames or 1
+        return {
+            'frames': self.frames,
+            'drawn_per_frame': self.total_drawn / frames,
+            'culled_per_frame': self.total_culled / frames,
+        }
+
+
+# Shared instance: the whole screen
+viewport = Viewport((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+
+
+def format_stats():
+    stats = viewport.stats()
+    return (f"Culling: {stats['drawn_per_frame']:.1f} drawn, "
+            f"{stats['culled_per_frame']:.1f} culled per frame over {stats['frames']} frames")
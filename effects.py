@@ -1,6 +1,27 @@
 import os
 import pygame
+from asset_registry import get_image, native_size
+from text_cache import render_text
+from alpha_cache import alpha_cache, faded
+from pulse import get_pulse, pulse_frame, pulse_frames
 from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from render_scale import world_width, world_height, world_size
+from culling import viewport
+
+# Float range (pixels up/down) of the effects that float while they pulse
+FLOAT_RANGES = {'ult_ready_popup': 10, 'ultimate_hud': 5}
+
+def master_cum_size(original_size):
+    # Calculate the original aspect ratio
+    aspect_ratio = original_size[0] / original_size[1]
+    
+    # Define the desired width and calculate the proportional height
+    # Increasing the width to ensure it doesn't look squeezed
+    target_width = 900  # Increased to 900 pixels for a much more dramatic effect
+    
+    # Ensure the height is at least 180 pixels for better visualization
+    target_height = max(180, int(target_width / aspect_ratio))
+    return (target_width, target_height)
 
 class Effects:
     def __init__(self):
@@ -16,14 +37,36 @@ class Effects:
         }
         # We delay loading the image to ensure pygame is initialized
     
+    def preload(self):
+        # Loads every image that would otherwise be loaded on first use, so the
+        # first crit or ultimate doesn't hitch in the middle of a fight.
+        # Must be called after the display has been created.
+        if self.milky_image is None:
+            self.milky_image = self._load_milky_image()
+        if self.master_cum_image is None:
+            self.master_cum_image = self._load_master_cum_image()
+        if self.ult_ready_hud_image is None or self.ult_not_ready_hud_image is None:
+            self._load_ult_hud_images()
+        if not self.ult_frames['right'] and not self.ult_frames['left']:
+            self._load_ultimate_frames()
+        # Fade-in/out variants of the full-size effect images
+        for image in (self.milky_image, self.master_cum_image):
+            if image is not None:
+                alpha_cache.prebuild(image)
+        # Pulse frames of the master cum effect and the ultimate HUD images
+        if self.master_cum_image is not None:
+            pulse_frames.cycle(self.master_cum_image, get_pulse(0.01, 0.1))
+        for image in (self.ult_ready_hud_image, self.ult_not_ready_hud_image):
+            if image is not None:
+                pulse_frames.cycle(image, get_pulse(0.005, 0.05))
+    
     def _load_milky_image(self):
         # Loads the Milky effect image.
         try:
             # Use the text_effects subfolder
             image_path = os.path.join('assets', 'effects', 'text_effects', 'milky.png')
-            image = pygame.image.load(image_path).convert_alpha()
             # Resize the image to a smaller size (150x150 pixels)
-            return pygame.transform.scale(image, (150, 150))
+            return get_image(image_path, size=(150, 150))
         except Exception as e:
             print(f"Error loading Milky effect image: {e}")
             return None
@@ -37,13 +80,11 @@ class Effects:
             
             # Load Ultimate Ready image
             ready_path = os.path.join(ult_hud_dir, 'ult_ready_hud.png')
-            ready_image = pygame.image.load(ready_path).convert_alpha()
-            self.ult_ready_hud_image = pygame.transform.scale(ready_image, (200, 200))
+            self.ult_ready_hud_image = get_image(ready_path, size=(200, 200))
             
             # Load Ultimate Not Ready image
             not_ready_path = os.path.join(ult_hud_dir, 'ult_not_ready_hud.png')
-            not_ready_image = pygame.image.load(not_ready_path).convert_alpha()
-            self.ult_not_ready_hud_image = pygame.transform.scale(not_ready_image, (200, 200))
+            self.ult_not_ready_hud_image = get_image(not_ready_path, size=(200, 200))
             
             return True
         except Exception as e:
@@ -56,24 +97,8 @@ class Effects:
         try:
             # Use the text_effects subfolder
             image_path = os.path.join('assets', 'effects', 'text_effects', 'master_cum.png')
-            original_image = pygame.image.load(image_path).convert_alpha()
-            
-            # Get the original dimensions
-            original_width = original_image.get_width()
-            original_height = original_image.get_height()
-            
-            # Calculate the original aspect ratio
-            aspect_ratio = original_width / original_height
-            
-            # Define the desired width and calculate the proportional height
-            # Increasing the width to ensure it doesn't look squeezed
-            target_width = 900  # Increased to 900 pixels for a much more dramatic effect
-            
-            # Ensure the height is at least 180 pixels for better visualization
-            target_height = max(180, int(target_width / aspect_ratio))
-            
             # Redimensionar a imagem mantendo a proporção original
-            scaled_image = pygame.transform.scale(original_image, (target_width, target_height))
+            scaled_image = get_image(image_path, size=master_cum_size(native_size(image_path)))
             
             return scaled_image
         except Exception as e:
@@ -91,7 +116,7 @@ class Effects:
             # If not, we'll continue without it as it's not critical for the animation
             popup_path = os.path.join(ult_anim_dir, 'ult_popup.png')
             if os.path.exists(popup_path):
-                self.ult_popup_image = pygame.image.load(popup_path).convert_alpha()
+                self.ult_popup_image = get_image(popup_path)
             else:
                 self.ult_popup_image = None
             
@@ -105,19 +130,8 @@ class Effects:
                 if not os.path.exists(image_path):
                     continue
                     
-                original_image = pygame.image.load(image_path).convert_alpha()
-                
-                # Obter o tamanho original da imagem
-                original_width = original_image.get_width()
-                original_height = original_image.get_height()
-                
-                # Aplicar o fator de escala base, mas manter as proporções originais
-                scaled_width = int(original_width * scale_factor)
-                scaled_height = int(original_height * scale_factor)
-                
                 # Escalar a imagem mantendo suas proporções originais
-                image = pygame.transform.scale(original_image, (scaled_width, scaled_height))
-                self.ult_frames['right'].append(image)
+                self.ult_frames['right'].append(get_image(image_path, scale=scale_factor))
                 
             # Load left direction frames
             for i in range(1, 5):
@@ -125,19 +139,8 @@ class Effects:
                 if not os.path.exists(image_path):
                     continue
                     
-                original_image = pygame.image.load(image_path).convert_alpha()
-                
-                # Obter o tamanho original da imagem
-                original_width = original_image.get_width()
-                original_height = original_image.get_height()
-                
-                # Aplicar o fator de escala base, mas manter as proporções originais
-                scaled_width = int(original_width * scale_factor)
-                scaled_height = int(original_height * scale_factor)
-                
                 # Escalar a imagem mantendo suas proporções originais
-                image = pygame.transform.scale(original_image, (scaled_width, scaled_height))
-                self.ult_frames['left'].append(image)
+                self.ult_frames['left'].append(get_image(image_path, scale=scale_factor))
                 
             return True
         except Exception as e:
@@ -166,11 +169,11 @@ class Effects:
             return
             
         # Calculate the position for the effect (centered on the player)
-        x = player_position[0] - self.milky_image.get_width() // 2
-        y = player_position[1] - self.milky_image.get_height() // 2
+        x = player_position[0] - world_width(self.milky_image) // 2
+        y = player_position[1] - world_height(self.milky_image) // 2
         
         # Ensure the effect doesn't go off-screen
-        x = max(0, min(x, SCREEN_WIDTH - self.milky_image.get_width()))
+        x = max(0, min(x, SCREEN_WIDTH - world_width(self.milky_image)))
         y = max(0, y)  # Prevent the effect from going off the top of the screen
             
         self.effects.append({
@@ -198,7 +201,7 @@ class Effects:
         
         # Calculate the position for the effect (canto superior direito da tela)
         image = self.ult_ready_hud_image if is_ready else self.ult_not_ready_hud_image
-        x = SCREEN_WIDTH - image.get_width() - 30  # 30 pixels da borda direita
+        x = SCREEN_WIDTH - world_width(image) - 30  # 30 pixels da borda direita
         y = 30  # 30 pixels do topo da tela
         
         # Verificar se já existe um efeito de ultimate_hud
@@ -219,8 +222,8 @@ class Effects:
             'duration': 9999,  # Praticamente infinito, será atualizado conforme necessário
             'frame': 0,
             'fade_in': True,
-            'scale': 1.0,
-            'scale_direction': 0.005,  # Amount to increase/decrease scale each frame for pulsating effect
+            'pulse': get_pulse(0.005, 0.05),  # Pulsating effect: scale 0.95-1.05 in 0.005 steps per frame
+            'pulse_phase': 0,
             'float_offset': 0,  # Used for floating animation
             'float_direction': 0.3,  # Pixels to move up/down per frame
             'show_text': True  # Flag to indicate that text should be shown
@@ -239,9 +242,9 @@ class Effects:
             return
             
         # Calculate the position for the effect (centered horizontally, higher vertically)
-        x = (SCREEN_WIDTH - self.master_cum_image.get_width()) // 2
+        x = (SCREEN_WIDTH - world_width(self.master_cum_image)) // 2
         # Posicionar mais alto na tela (1/3 da altura da tela)
-        y = SCREEN_HEIGHT // 3 - 100 - self.master_cum_image.get_height() // 2
+        y = SCREEN_HEIGHT // 3 - 100 - world_height(self.master_cum_image) // 2
         
         # Add the effect to the list
         self.effects.append({
@@ -252,8 +255,8 @@ class Effects:
             'duration': 60,  # 1 second at 60 FPS
             'frame': 0,
             'fade_in': True,
-            'scale': 1.0,
-            'scale_direction': 0.01  # Amount to increase/decrease scale each frame for pulsating effect
+            'pulse': get_pulse(0.01, 0.1),  # Pulsating effect: scale 0.9-1.1 in 0.01 steps per frame
+            'pulse_phase': 0
         })
         
     def add_ultimate_effect(self, player_position, direction='right'):
@@ -290,8 +293,8 @@ class Effects:
         
         # Calculate different positions for each frame to create a directional effect
         for i, frame in enumerate(frames):
-            frame_width = frame.get_width()
-            frame_height = frame.get_height()
+            frame_width = world_width(frame)
+            frame_height = world_height(frame)
             
             # Adjust position based on direction
             if direction == 'right':
@@ -309,8 +312,8 @@ class Effects:
         # Calculate the effect area for damage application
         # The effect area is based on the last frame (frame 4) which has the largest reach
         last_frame = frames[-1]
-        last_frame_width = last_frame.get_width()
-        last_frame_height = last_frame.get_height()
+        last_frame_width = world_width(last_frame)
+        last_frame_height = world_height(last_frame)
         
         # Define the area of effect based on direction
         if direction == 'right':
@@ -360,6 +363,15 @@ class Effects:
         for i, effect in enumerate(self.effects):
             # Increment the frame counter
             effect['frame'] = effect['frame'] + 1 if 'frame' in effect else 0
+
+            # Advance the pulsating and floating animations (draw() only reads them)
+            if 'pulse' in effect:
+                effect['pulse_phase'] += 1
+                float_range = FLOAT_RANGES.get(effect['type'])
+                if float_range is not None and 'float_offset' in effect and 'float_direction' in effect:
+                    effect['float_offset'] += effect['float_direction']
+                    if abs(effect['float_offset']) > float_range:
+                        effect['float_direction'] *= -1
             
             # Handle different effect types
             if effect['type'] == 'ultimate_animated':
@@ -395,8 +407,8 @@ class Effects:
                 self.effects.pop(i)
     
     def draw(self, screen):
-        # Draws all active effects on the screen.
-        
+        # Draws all active effects on the screen. Returns the rects drawn.
+        rects = []
         for effect in self.effects:
             
             # Draw the actual effect
@@ -404,10 +416,10 @@ class Effects:
                 # Check if the position exists in the effect
                 if 'position' not in effect:
                     continue
-                # Create a copy of the image with the current alpha
-                img_copy = self.milky_image.copy()
-                img_copy.set_alpha(effect['alpha'])
-                screen.blit(img_copy, effect['position'])
+                # Shared faded variant of the image at the current alpha
+                img_faded = faded(self.milky_image, effect['alpha'])
+                if img_faded is not None and viewport.visible_at(img_faded, effect['position']):
+                    rects.append(screen.blit(img_faded, effect['position']))
                     
             elif effect['type'] == 'ultimate_animated':
                 # Handle the animated ultimate effect
@@ -424,8 +436,9 @@ class Effects:
                 # Get the position for this specific frame
                 frame_position = effect['frame_positions'][frame_index]
                 
-                # Draw the frame at its specific position
-                screen.blit(frame_img, frame_position)
+                # Draw the frame at its specific position (the outer frames can leave the screen)
+                if viewport.visible_at(frame_img, frame_position):
+                    rects.append(screen.blit(frame_img, frame_position))
                 
             elif effect['type'] == 'master_cum' and self.master_cum_image:
                 # Handle the master cum effect (central screen effect)
@@ -433,22 +446,14 @@ class Effects:
                     continue
                     
                 # Apply scaling for pulsating effect if needed
-                if 'scale' in effect and 'scale_direction' in effect:
-                    effect['scale'] += effect['scale_direction']
-                    # Reverse direction if scale gets too large or too small
-                    if effect['scale'] > 1.1 or effect['scale'] < 0.9:
-                        effect['scale_direction'] *= -1
-                        
+                if 'pulse' in effect:
                     # Get the original dimensions of the image
-                    original_width = self.master_cum_image.get_width()
-                    original_height = self.master_cum_image.get_height()
-                    
-                    # Calculate the new dimensions while maintaining the aspect ratio
-                    new_width = int(original_width * effect['scale'])
-                    new_height = int(original_height * effect['scale'])
+                    original_width = world_width(self.master_cum_image)
+                    original_height = world_height(self.master_cum_image)
                     
-                    # Rescale the image while maintaining the original aspect ratio
-                    scaled_surface = pygame.transform.scale(self.master_cum_image, (new_width, new_height))
+                    # Pre-scaled frame of the pulse cycle (aspect ratio preserved)
+                    scaled_surface = pulse_frame(self.master_cum_image, effect['pulse'], effect['pulse_phase'])
+                    new_width, new_height = world_size(scaled_surface)
                     
                     # Adjust the position to keep it centered
                     x, y = effect['position']
@@ -457,14 +462,15 @@ class Effects:
                     new_x = center_x - new_width // 2
                     new_y = center_y - new_height // 2
                     
-                    # Set alpha and blit
+                    # Set alpha and blit. The frame is shared, so its alpha is set
+                    # before every blit (an alpha cache per pulse frame would be too big)
                     scaled_surface.set_alpha(effect['alpha'])
-                    screen.blit(scaled_surface, (new_x, new_y))
+                    rects.append(screen.blit(scaled_surface, (new_x, new_y)))
                 else:
                     # Just apply alpha if no scaling info
-                    img_copy = self.master_cum_image.copy()
-                    img_copy.set_alpha(effect['alpha'])
-                    screen.blit(img_copy, effect['position'])
+                    img_faded = faded(self.master_cum_image, effect['alpha'])
+                    if img_faded is not None:
+                        rects.append(screen.blit(img_faded, effect['position']))
                     
             elif effect['type'] == 'ult_ready_popup' and self.ult_popup_image:
                 # Handle the ultimate ready popup effect
@@ -472,28 +478,14 @@ class Effects:
                     continue
                     
                 # Apply scaling and floating animation
-                if 'scale' in effect and 'scale_direction' in effect:
-                    # Update scale for pulsating effect
-                    effect['scale'] += effect['scale_direction']
-                    if effect['scale'] > 1.1 or effect['scale'] < 0.9:
-                        effect['scale_direction'] *= -1
-                    
-                    # Update floating animation
-                    if 'float_offset' in effect and 'float_direction' in effect:
-                        effect['float_offset'] += effect['float_direction']
-                        if abs(effect['float_offset']) > 10:  # Maximum float distance
-                            effect['float_direction'] *= -1
-                    
+                if 'pulse' in effect:
                     # Get original dimensions
-                    original_width = self.ult_popup_image.get_width()
-                    original_height = self.ult_popup_image.get_height()
-                    
-                    # Calculate new dimensions
-                    new_width = int(original_width * effect['scale'])
-                    new_height = int(original_height * effect['scale'])
+                    original_width = world_width(self.ult_popup_image)
+                    original_height = world_height(self.ult_popup_image)
                     
-                    # Scale the image
-                    scaled_surface = pygame.transform.scale(self.ult_popup_image, (new_width, new_height))
+                    # Pre-scaled frame of the pulse cycle
+                    scaled_surface = pulse_frame(self.ult_popup_image, effect['pulse'], effect['pulse_phase'])
+                    new_width, new_height = world_size(scaled_surface)
                     
                     # Adjust position for scaling and floating
                     x, y = effect['position']
@@ -504,32 +496,27 @@ class Effects:
                     
                     # Set alpha and blit
                     scaled_surface.set_alpha(effect['alpha'])
-                    screen.blit(scaled_surface, (new_x, new_y))
+                    rects.append(screen.blit(scaled_surface, (new_x, new_y)))
                     
                     # Add the "Ultimate Ready" text below the icon
                     if effect.get('show_text', False):
-                        font = pygame.font.SysFont(None, 36)  # Font and size
                         text_color = (255, 255, 0)  # Yellow
-                        text_surface = font.render("Ultimate Ready", True, text_color)
-                        
-                        # Apply the same alpha to the text
-                        text_surface.set_alpha(effect['alpha'])
+                        text_surface = render_text("Ultimate Ready", 36, text_color)
                         
                         # Position the text centered below the icon
-                        text_x = new_x + (new_width - text_surface.get_width()) // 2
+                        text_x = new_x + (new_width - world_width(text_surface)) // 2
                         text_y = new_y + new_height + 10  # 10 pixels below the icon
                         text_color = (255, 255, 255)  # White
-                        text_surface = font.render("Ultimate Ready", True, text_color)
-                        
-                        # Apply the same alpha to the text
-                        text_surface.set_alpha(effect['alpha'])
+                        text_surface = render_text("Ultimate Ready", 36, text_color)
                         
                         # Position the text centered below the icon
-                        text_x = effect['position'][0] + (self.ult_popup_image.get_width() - text_surface.get_width()) // 2
-                        text_y = effect['position'][1] + self.ult_popup_image.get_height() + 10  # 10 pixels below the icon
+                        text_x = effect['position'][0] + (world_width(self.ult_popup_image) - world_width(text_surface)) // 2
+                        text_y = effect['position'][1] + world_height(self.ult_popup_image) + 10  # 10 pixels below the icon
                         
-                        # Draw the text
-                        screen.blit(text_surface, (text_x, text_y))
+                        # Draw the text with the same alpha as the icon
+                        text_faded = faded(text_surface, effect['alpha'])
+                        if text_faded is not None:
+                            rects.append(screen.blit(text_faded, (text_x, text_y)))
 
             elif effect['type'] == 'ultimate_hud':
                 # Handle the ultimate HUD effect (ready or not ready)
@@ -542,28 +529,14 @@ class Effects:
                     continue
                     
                 # Apply scaling and floating animation
-                if 'scale' in effect and 'scale_direction' in effect:
-                    # Update scale for pulsating effect
-                    effect['scale'] += effect['scale_direction']
-                    if effect['scale'] > 1.05 or effect['scale'] < 0.95:
-                        effect['scale_direction'] *= -1
-                    
-                    # Update floating animation
-                    if 'float_offset' in effect and 'float_direction' in effect:
-                        effect['float_offset'] += effect['float_direction']
-                        if abs(effect['float_offset']) > 5:  # Maximum float distance
-                            effect['float_direction'] *= -1
-                    
+                if 'pulse' in effect:
                     # Get original dimensions
-                    original_width = hud_image.get_width()
-                    original_height = hud_image.get_height()
-                    
-                    # Calculate new dimensions
-                    new_width = int(original_width * effect['scale'])
-                    new_height = int(original_height * effect['scale'])
+                    original_width = world_width(hud_image)
+                    original_height = world_height(hud_image)
                     
-                    # Scale the image
-                    scaled_surface = pygame.transform.scale(hud_image, (new_width, new_height))
+                    # Pre-scaled frame of the pulse cycle
+                    scaled_surface = pulse_frame(hud_image, effect['pulse'], effect['pulse_phase'])
+                    new_width, new_height = world_size(scaled_surface)
                     
                     # Adjust position for scaling and floating
                     x, y = effect['position']
@@ -574,11 +547,10 @@ class Effects:
                     
                     # Set alpha and blit
                     scaled_surface.set_alpha(effect['alpha'])
-                    screen.blit(scaled_surface, (new_x, new_y))
+                    rects.append(screen.blit(scaled_surface, (new_x, new_y)))
                     
                     # Add the appropriate text below the icon
                     if effect.get('show_text', False):
-                        font = pygame.font.SysFont(None, 36)  # Font and size
                         
                         # Text and color depend on the ultimate state
                         if effect['is_ready']:
@@ -588,26 +560,24 @@ class Effects:
                             text_color = (200, 200, 200)  # Light gray for Not Ready
                             text_content = "Ultimate Not Ready"
                         
-                        text_surface = font.render(text_content, True, text_color)
-                        
-                        # Apply the same alpha to the text
-                        text_surface.set_alpha(effect['alpha'])
+                        text_surface = render_text(text_content, 36, text_color)
                         
                         # Position the text centered below the icon
-                        text_x = new_x + (new_width - text_surface.get_width()) // 2
+                        text_x = new_x + (new_width - world_width(text_surface)) // 2
                         text_y = new_y + new_height + 10  # 10 pixels below the icon
                         
-                        # Draw the text
-                        screen.blit(text_surface, (text_x, text_y))
+                        # Draw the text with the same alpha as the icon
+                        text_faded = faded(text_surface, effect['alpha'])
+                        if text_faded is not None:
+                            rects.append(screen.blit(text_faded, (text_x, text_y)))
                 else:
                     # Just apply alpha if no scaling info
-                    img_copy = hud_image.copy()
-                    img_copy.set_alpha(effect['alpha'])
-                    screen.blit(img_copy, effect['position'])
+                    img_faded = faded(hud_image, effect['alpha'])
+                    if img_faded is not None:
+                        rects.append(screen.blit(img_faded, effect['position']))
                     
                     # Add the appropriate text below the icon
                     if effect.get('show_text', False):
-                        font = pygame.font.SysFont(None, 36)  # Font and size
                         
                         # Text and color depend on the ultimate state
                         if effect['is_ready']:
@@ -617,14 +587,14 @@ class Effects:
                             text_color = (200, 200, 200)  # Light gray for Not Ready
                             text_content = "Ultimate Not Ready"
                             
-                        text_surface = font.render(text_content, True, text_color)
-                        
-                        # Apply the same alpha to the text
-                        text_surface.set_alpha(effect['alpha'])
+                        text_surface = render_text(text_content, 36, text_color)
                         
                         # Position the text aligned with the icon in the top right corner
                         text_x = effect['position'][0]  # Alinhado à esquerda com o ícone
-                        text_y = effect['position'][1] + hud_image.get_height() + 5  # 5 pixels below the icon
+                        text_y = effect['position'][1] + world_height(hud_image) + 5  # 5 pixels below the icon
                         
-                        # Draw the text
-                        screen.blit(text_surface, (text_x, text_y))
+                        # Draw the text with the same alpha as the icon
+                        text_faded = faded(text_surface, effect['alpha'])
+                        if text_faded is not None:
+                            rects.append(screen.blit(text_faded, (text_x, text_y)))
+        return rects
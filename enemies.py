@@ -1,12 +1,24 @@
 import os
-import random
 import pygame
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from asset_registry import get_image, get_frames
+from alpha_cache import alpha_cache, faded
+from render_queue import LAYER_ENEMIES, LAYER_HEALTH_BARS
+from culling import viewport
+from lifecycle import ALIVE, DYING, RETIRED
+from hitboxes import get_enemy_hitbox
 
 ENEMY_SIZE = (180, 180)
 
+# Enemy frame sets: name -> (left frames, right frames, dead image, subfolder)
+ENEMY_FRAME_SETS = {
+    'fat_girl': (3, 3, 'dead_fat_girl', 'fat_girl'),
+    'wolf': (4, 4, 'dead_wolf', 'wolf'),
+    'blue_bird': (4, 4, 'dead_blue_bird', 'blue_bird'),
+    'red_bird': (4, 4, 'dead_red_bird', 'red_bird'),
+}
 
-def load_enemy_frames(enemy_name, left_count, right_count, dead_name, subfolder=None):
+
+def enemy_frame_paths(enemy_name, left_count, right_count, dead_name, subfolder=None):
     # Base directory for enemies
     enemy_dir = os.path.join('assets', 'enemies')
     
@@ -14,54 +26,61 @@ def load_enemy_frames(enemy_name, left_count, right_count, dead_name, subfolder=
     if subfolder:
         enemy_dir = os.path.join(enemy_dir, subfolder)
     
-    frames = {
-        'left': [],
-        'right': [],
-        'dead': None
-    }
-    
-    for i in range(1, left_count + 1):
-        path = os.path.join(enemy_dir, f'{enemy_name}_left_{i}.png')
-        img = pygame.image.load(path).convert_alpha()
-        img = pygame.transform.scale(img, ENEMY_SIZE)
-        frames['left'].append(img)
-    
-    for i in range(1, right_count + 1):
-        path = os.path.join(enemy_dir, f'{enemy_name}_right_{i}.png')
-        img = pygame.image.load(path).convert_alpha()
-        img = pygame.transform.scale(img, ENEMY_SIZE)
-        frames['right'].append(img)
-    
+    left_paths = [os.path.join(enemy_dir, f'{enemy_name}_left_{i}.png') for i in range(1, left_count + 1)]
+    right_paths = [os.path.join(enemy_dir, f'{enemy_name}_right_{i}.png') for i in range(1, right_count + 1)]
     dead_path = os.path.join(enemy_dir, dead_name + '.png')
-    frames['dead'] = pygame.image.load(dead_path).convert_alpha()
-    frames['dead'] = pygame.transform.scale(frames['dead'], ENEMY_SIZE)
-    
-    return frames
+    return left_paths, right_paths, dead_path
+
+
+def load_enemy_frames(enemy_name, left_count, right_count, dead_name, subfolder=None):
+    left_paths, right_paths, dead_path = enemy_frame_paths(enemy_name, left_count, right_count, dead_name, subfolder)
+    # Surfaces are shared through the asset registry, so only the first
+    # enemy of each type touches the disk
+    return {
+        'left': get_frames(left_paths, size=ENEMY_SIZE),
+        'right': get_frames(right_paths, size=ENEMY_SIZE),
+        'dead': get_image(dead_path, size=ENEMY_SIZE)
+    }
+
+def preload_fades():
+    # Precomputes the fade-out variants of every dead frame, so the first
+    # corpse of each type doesn't allocate while it fades
+    for name, frame_set in ENEMY_FRAME_SETS.items():
+        alpha_cache.prebuild(load_enemy_frames(name, *frame_set)['dead'])
 
 # --- Enemy base class: logic, damage, drawing, and death ---
 class Enemy:
     def __init__(self, x, y, direction, frames, max_hp, speed):
-        self.dmg_cooldown = 0  # Cooldown to apply damage to player
         self.damage_popups = []  # (damage, x, y, alpha, timer)
+        self.frames = frames
+        self.width = ENEMY_SIZE[0]
+        self.height = ENEMY_SIZE[1]
+        self.anim_speed = 0.13
+        self.max_hp = max_hp
+        self.respawn(x, y, direction, speed)
+
+    def respawn(self, x, y, direction, speed):
+        # Per-spawn state, set by __init__ and again when a pooled enemy is reused
+        from hud import release_popups
+        release_popups(self.damage_popups)
+        self.dmg_cooldown = 0  # Cooldown to apply damage to player
         self.x = x
         self.y = y
         self.direction = direction  # 'left' or 'right'
-        self.frames = frames
         self.state = 'walk'  # 'walk' or 'dead'
         self.anim_index = 0
-        self.width = ENEMY_SIZE[0]
-        self.height = ENEMY_SIZE[1]
         self.anim_timer = 0
-        self.anim_speed = 0.13
-        self.hp = max_hp
-        self.max_hp = max_hp
+        self.hp = self.max_hp
         self.speed = speed
-        self.rect = pygame.Rect(self.x + 30, self.y + 40, 100, 120)
+        self.rect = get_enemy_hitbox(self)
         self.dead_timer = 0
-        # Sistema de drops genérico
-        self.drop_type = None  # Tipo de item que o inimigo dropa (None, 'health_potion', 'mana_potion', etc)
-        self.drop_chance = 1.0  # Chance de dropar o item (1.0 = 100%)
-        self.item_dropped = False  # Indica se já dropou o item
+        self.fade_alpha = 255  # Only used once dead (set again on death)
+
+    def reset(self, x, y, direction, speed, dmg_min, dmg_max):
+        # Pooled reuse (see pool.py): same arguments as the subclass constructors
+        self.respawn(x, y, direction, speed)
+        self.dmg_min = dmg_min
+        self.dmg_max = dmg_max
 
     def update(self, player):
         from hud import update_damage_popups
@@ -98,41 +117,57 @@ class Enemy:
         # Centralized above the health bar
         bar_x = self.x + ENEMY_SIZE[0] // 2
         bar_y = self.y - 25
-        self.damage_popups.append([str(dmg), bar_x, bar_y, 255, 0, "damage"])
+        from hud import add_popup
+        add_popup(self.damage_popups, str(dmg), bar_x, bar_y, "damage")
         if self.hp <= 0 and self.state != 'dead':
             self.state = 'dead'
             self.anim_index = 0
             self.dead_timer = 0
             self.fade_alpha = 255
 
-    def draw(self, screen):
-        # Draws the enemy on the screen.
-        
+    def lifecycle_phase(self):
+        # Dying while the corpse fades out or popups are still showing; retired
+        # once nothing is left on screen (birds never come back once they leave)
+        if self.damage_popups:
+            return DYING if self.state == 'dead' else ALIVE
+        if not viewport.contains(self.bounds()):
+            return RETIRED
+        if self.state != 'dead':
+            return ALIVE
+        return DYING if self.fade_alpha > 0 else RETIRED
+
+    def bounds(self):
+        # Area covered by the sprite and the health bar above it
+        return pygame.Rect(self.x, self.y - 10, self.width, self.height + 10)
+
+    def draw(self, queue):
+        # Submits the enemy's draw commands to the render queue (nothing when
+        # off-screen; popups are culled on their own).
+        from hud import draw_damage_popups
+        draw_damage_popups(queue, self.damage_popups)
+        if not viewport.visible(self.bounds()):
+            return
         if self.state == 'dead':
             if self.frames['dead']:
                 dead_img = self.frames['dead']
                 if hasattr(self, 'fade_alpha'):
-                    # Create a copy of the image with adjusted alpha
-                    dead_img = dead_img.copy()
-                    alpha_img = pygame.Surface(dead_img.get_size(), pygame.SRCALPHA)
-                    alpha_img.fill((255, 255, 255, self.fade_alpha))
-                    dead_img.blit(alpha_img, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-                screen.blit(dead_img, (self.x, self.y))
+                    # Shared, precomputed copy of the image with adjusted alpha
+                    dead_img = faded(dead_img, self.fade_alpha)
+                if dead_img is not None:
+                    queue.submit(dead_img, (self.x, self.y), LAYER_ENEMIES)
         else:
             current_frame = self.frames[self.direction][self.anim_index]
-            screen.blit(current_frame, (self.x, self.y))
-        # Health bar
+            queue.submit(current_frame, (self.x, self.y), LAYER_ENEMIES)
+        # Health bar: one shared, prerendered sprite per hp value
         if self.state != 'dead':
-            from hud import draw_health_bar
-            draw_health_bar(screen, self.x+30, self.y-10, 100, 14, self.hp, self.max_hp)
-        # Damage popups
-        from hud import draw_damage_popups
-        draw_damage_popups(screen, self.damage_popups)
+            from hud import health_bar_sprite
+            bar, (dx, dy) = health_bar_sprite(self.hp, self.max_hp, 100, 14)
+            queue.submit(bar, (self.x+30+dx, self.y-10+dy), LAYER_HEALTH_BARS)
 
 class FatGirlEnemy(Enemy):
     def __init__(self, x, y, direction, speed=3, dmg_min=3, dmg_max=11):
         # Use the 'fat_girl' subfolder for this enemy type
-        frames = load_enemy_frames('fat_girl', 3, 3, 'dead_fat_girl', subfolder='fat_girl')
+        frames = load_enemy_frames('fat_girl', *ENEMY_FRAME_SETS['fat_girl'])
         super().__init__(x, y, direction, frames, max_hp=10, speed=speed)
         self.dmg_min = dmg_min
         self.dmg_max = dmg_max
@@ -140,7 +175,7 @@ class FatGirlEnemy(Enemy):
 class WolfEnemy(Enemy):
     def __init__(self, x, y, direction, speed=6, dmg_min=1, dmg_max=7):
         # Use the 'wolf' subfolder for this enemy type
-        frames = load_enemy_frames('wolf', 4, 4, 'dead_wolf', subfolder='wolf')
+        frames = load_enemy_frames('wolf', *ENEMY_FRAME_SETS['wolf'])
         super().__init__(x, y, direction, frames, max_hp=5, speed=speed)
         self.dmg_min = dmg_min
         self.dmg_max = dmg_max
@@ -156,6 +191,12 @@ class BirdEnemy(Enemy):
         self.base_y = y
         self.osc_time = 0
 
+    def reset(self, x, y, direction, speed, dmg_min, dmg_max):
+        super().reset(x, y, direction, speed, dmg_min, dmg_max)
+        self.base_y = y
+        self.osc_time = 0
+        self.fall_vy = 0
+
     def update(self, player):
         from hud import update_damage_popups
         update_damage_popups(self.damage_popups)
@@ -191,11 +232,8 @@ class BlueBirdEnemy(BirdEnemy):
     def __init__(self, x, y, direction, speed=7, dmg_min=2, dmg_max=6):
         # Use the 'blue_bird' subfolder for this enemy type
         super().__init__('blue_bird', x, y, direction, speed, dmg_min, dmg_max, subfolder='blue_bird')
-        self.drop_type = 'mana_potion'  # Blue birds drop mana potions when they die
-        self.drop_chance = 1.0  # 100% chance to drop
 
 class RedBirdEnemy(BirdEnemy):
     def __init__(self, x, y, direction, speed=7, dmg_min=2, dmg_max=6):
         # Use the 'red_bird' subfolder for this enemy type
         super().__init__('red_bird', x, y, direction, speed, dmg_min, dmg_max, subfolder='red_bird')
-        self.drop_type = 'health_potion'  # Red birds drop health potions when they die
\ No newline at end of file
@@ -1,23 +1,141 @@
 import pygame
 import os
+from settings import AUDIO_PRESETS, AUDIO_PRESET
 
 # Path to the soundtrack (assumes the file game_sounds/soundtrack.mp3 exists)
 SOUNDTRACK_PATH = os.path.join(os.path.dirname(__file__), 'assets', 'game_sounds', 'soundtrack.mp3')
 MILKY_PATH = os.path.join(os.path.dirname(__file__), 'assets', 'game_sounds', 'milky.mp3')
 ULTIMATE_PATH = os.path.join(os.path.dirname(__file__), 'assets', 'game_sounds', 'ultimate.mp3')
 
-# Initialize the mixer with more channels
-pygame.mixer.init()
-pygame.mixer.set_num_channels(8)  # Increase the number of available channels
+BAKED_SOUNDS_DIR = os.path.join(os.path.dirname(__file__), 'assets', 'game_sounds', 'baked')
+
+
+def init_mixer(preset=AUDIO_PRESET):
+    # Single place the mixer is configured; later calls are no-ops
+    if pygame.mixer.get_init():
+        return
+    config = AUDIO_PRESETS[preset]
+    # pre_init too, so a later pygame.init() keeps the same settings
+    pygame.mixer.pre_init(config['frequency'], config['size'], config['channels'], config['buffer'])
+    pygame.mixer.init(config['frequency'], config['size'], config['channels'], config['buffer'])
+
+
+def baked_sound_path(name, mixer_format=None):
+    # Raw PCM written by audio_build.py for one exact mixer format
+    frequency, size, channels = mixer_format or pygame.mixer.get_init()
+    return os.path.join(BAKED_SOUNDS_DIR, f'{name}_{frequency}_{size}_{channels}.pcm')
+
+
+init_mixer()
+
+SFX_CHANNELS = 8  # Size of the sound effect voice pool (music streams separately)
+
+# Effect name -> (path, volume, priority). Higher priority effects may steal
+# the voice of a lower priority one when every channel is busy.
+SOUND_EFFECTS = {
+    'milky': (MILKY_PATH, 1.0, 1),
+    'ultimate': (ULTIMATE_PATH, 0.8, 10),  # A bit louder for dramatic effect
+}
+
+
+# --- Sound bank: effects decoded once, played on a managed pool of channels ---
+class SoundBank:
+    def __init__(self, num_channels=SFX_CHANNELS):
+        pygame.mixer.set_num_channels(num_channels)
+        # Reserve every channel so Sound.play() never picks one behind our back
+        pygame.mixer.set_reserved(num_channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(num_channels)]
+        self.voices = [None] * num_channels  # (priority, start_order) of what each channel plays
+        self.sounds = {}  # name -> (Sound, priority)
+        self.triggered = set()  # Effects already started this frame
+        self.play_order = 0
+        self.plays = 0
+        self.coalesced = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def load(self, name, path, volume=1.0, priority=0):
+        if name in self.sounds:
+            return
+        baked_path = baked_sound_path(name)
+        if os.path.exists(baked_path):
+            # Already in the mixer's native format: no decoding or resampling
+            with open(baked_path, 'rb') as f:
+                sound = pygame.mixer.Sound(buffer=f.read())
+        else:
+            sound = pygame.mixer.Sound(path)
+        sound.set_volume(volume)
+        self.sounds[name] = (sound, priority)
+
+    def load_all(self, effects=SOUND_EFFECTS):
+        for name, (path, volume, priority) in effects.items():
+            try:
+                self.load(name, path, volume, priority)
+            except Exception as e:
+                print(f"Error loading sound effect '{name}': {e}")
+
+    def next_frame(self):
+        # Called once per game frame; identical triggers within a frame play once
+        self.triggered.clear()
+
+    def play(self, name):
+        if name in self.triggered:
+            self.coalesced += 1
+            return None
+        self.triggered.add(name)
+        entry = self.sounds.get(name)
+        if entry is None:
+            return None
+        sound, priority = entry
+        index = self._pick_channel(priority)
+        if index is None:
+            self.dropped += 1
+            return None
+        self.play_order += 1
+        self.voices[index] = (priority, self.play_order)
+        channel = self.channels[index]
+        channel.play(sound)
+        self.plays += 1
+        return channel
+
+    def _pick_channel(self, priority):
+        # Free channel first, otherwise steal the lowest priority (then oldest)
+        # voice that isn't more important than the new one
+        victim = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+            voice = self.voices[i]
+            if voice is not None and voice[0] <= priority and (victim is None or voice < self.voices[victim]):
+                victim = i
+        if victim is not None:
+            self.channels[victim].stop()
+            self.stolen += 1
+        return victim
+
+    def stats(self):
+        return {
+            'plays': self.plays,
+            'coalesced': self.coalesced,
+            'stolen': self.stolen,
+            'dropped': self.dropped,
+            'busy': sum(1 for channel in self.channels if channel.get_busy()),
+        }
+
+
+sound_bank = SoundBank()
+
+
+def format_stats():
+    stats = sound_bank.stats()
+    return (f"Sounds: {stats['plays']} played, {stats['coalesced']} coalesced, "
+            f"{stats['stolen']} stolen, {stats['dropped']} dropped, {stats['busy']} channels busy")
 
-# Reserve channels for sound effects
-MILKY_CHANNEL = pygame.mixer.Channel(1)  # Channel 0 is used for background music
-ULTIMATE_CHANNEL = pygame.mixer.Channel(2)  # Channel 2 for ultimate sound effect
 
 class GameSounds:
     @staticmethod
     def play_soundtrack():
-        pygame.mixer.init()
+        init_mixer()
         pygame.mixer.music.load(SOUNDTRACK_PATH)
         pygame.mixer.music.play(-1)  # -1 means loop forever
 
@@ -43,18 +161,16 @@ class GameSounds:
     def resume():
         pygame.mixer.music.unpause()
 
+    @staticmethod
+    def load_effects():
+        # Decode every sound effect once, up front
+        sound_bank.load_all()
+
     @staticmethod
     def play_milky_effect():
-        # Load the Milky sound effect
-        milky_sound = pygame.mixer.Sound(MILKY_PATH)
-        # Plays the sound effect on a separate channel to avoid interrupting the background music
-        MILKY_CHANNEL.play(milky_sound)
+        # Plays on the managed voice pool so it never interrupts the background music
+        sound_bank.play('milky')
         
     @staticmethod
     def play_ultimate_effect():
-        # Load the Ultimate sound effect
-        ultimate_sound = pygame.mixer.Sound(ULTIMATE_PATH)
-        # Set volume a bit higher for dramatic effect
-        ultimate_sound.set_volume(0.8)
-        # Plays the sound effect on a separate channel to avoid interrupting the background music
-        ULTIMATE_CHANNEL.play(ultimate_sound)
+        sound_bank.play('ultimate')
@@ -1,4 +1,7 @@
 import pygame
+from asset_registry import get_image
+from text_cache import render_text
+from render_scale import world_width, world_size, present, make_layer, to_world_rect
 
 # --- Manages all game states (menu, playing, paused, game over) ---
 class GameState:
@@ -20,12 +23,12 @@ class GameState:
             background.draw(screen)
             fade.set_alpha(alpha)
             screen.blit(fade, (0,0))
-            pygame.display.flip()
+            present(screen)
             pygame.time.delay(16)
             alpha = min(255, alpha + 8)
         fade.set_alpha(255)
         screen.blit(fade, (0,0))
-        pygame.display.flip()
+        present(screen)
         pygame.time.delay(300)
 
     def __init__(self):
@@ -37,6 +40,8 @@ class GameState:
         self.menu_index = 0
         self.pause_index = 0
         self.gameover_index = 0
+        self.pause_snapshot = None  # Dimmed copy of the last gameplay frame while paused
+        self.screen_layers = {}  # State -> (signature, prerendered screen, world position)
         try:
             from game_sounds import GameSounds
             GameSounds.set_volume(self.music_volume)
@@ -48,6 +53,8 @@ class GameState:
 
     def set_state(self, new_state):
         self.state = new_state
+        if new_state != GameState.PAUSED:
+            self.pause_snapshot = None
 
     def is_playing(self):
         return self.state == GameState.PLAYING
@@ -142,31 +149,76 @@ class GameState:
             elif self.state == GameState.PAUSED and event.key == pygame.K_ESCAPE:
                 self.set_state(GameState.PLAYING)
 
+    def screen_signature(self):
+        # Everything the menu/pause/game over/settings screens depend on. When it
+        # doesn't change between frames the screen doesn't need redrawing (the
+        # dirty-rect renderer uses a static backdrop instead of the scrolling one)
+        return (self.state, self.menu_index, self.pause_index, self.gameover_index,
+                self.settings_index, self.music_on, round(self.music_volume, 2),
+                getattr(self, 'last_kills', 0), getattr(self, 'last_time', 0))
+
     def update(self, player):
         if self.state == GameState.PLAYING and player.hp <= 0:
             self.set_state(GameState.GAME_OVER)
 
+    def freeze(self, screen):
+        # Keeps the last gameplay frame, dimmed, as the pause screen backdrop so
+        # nothing of the game pipeline runs while paused
+        snapshot = screen.copy()
+        shade = pygame.Surface(snapshot.get_size())
+        shade.set_alpha(120)
+        snapshot.blit(shade, (0, 0))
+        self.pause_snapshot = snapshot
+
     def draw(self, screen, font, screen_width, screen_height, background=None):
+        # Redraws the (animated) backdrop, then blits the prerendered text of
+        # the current screen; that layer is only rebuilt when the selection or
+        # a value on it changes
         leave_game = False
-        if self.state == GameState.MENU:
+        if self.state not in (GameState.MENU, GameState.PAUSED, GameState.GAME_OVER, 'settings'):
+            return leave_game
+        if self.state == GameState.PAUSED and self.pause_snapshot is not None:
+            # Frozen game frame
+            screen.blit(self.pause_snapshot, (0, 0))
+        elif background:
             # Animated background
-            if background:
-                background.update()
-                background.draw(screen)
-            else:
-                screen.fill((30, 30, 30))
+            background.update()
+            background.draw(screen)
+        else:
+            screen.fill((20,0,0) if self.state == GameState.GAME_OVER else (30, 30, 30))
+        layer, position = self.screen_layer(screen_width, screen_height)
+        screen.blit(layer, position)
+        return leave_game
+
+    def screen_layer(self, screen_width, screen_height):
+        # Cached, cropped rendering of everything on the current screen except
+        # the backdrop: one per screen, keyed by screen_signature()
+        signature = self.screen_signature()
+        cached = self.screen_layers.get(self.state)
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2]
+        layer = make_layer((screen_width, screen_height))
+        self.draw_screen_text(layer, screen_width, screen_height)
+        bounds = layer.get_bounding_rect()
+        cropped = layer.subsurface(bounds).copy()
+        # RLE lets the blit skip the transparent runs between lines of text
+        cropped.set_alpha(255, pygame.RLEACCEL)
+        position = to_world_rect(bounds).topleft
+        self.screen_layers[self.state] = (signature, cropped, position)
+        return cropped, position
+
+    def draw_screen_text(self, screen, screen_width, screen_height):
+        if self.state == GameState.MENU:
             # Logo
             import os
             logo_path = os.path.join('assets', 'logo', 'logo.png')
             if not hasattr(self, 'logo_img'):
                 if os.path.exists(logo_path):
-                    logo_img = pygame.image.load(logo_path).convert_alpha()
-                    logo_img = pygame.transform.smoothscale(logo_img, (400, 200))
-                    self.logo_img = logo_img
+                    self.logo_img = get_image(logo_path, size=(400, 200), smooth=True)
                 else:
                     self.logo_img = None
             if self.logo_img:
-                logo_rect = self.logo_img.get_rect()
+                logo_rect = pygame.Rect((0, 0), world_size(self.logo_img))
                 logo_rect.centerx = screen_width // 2
                 logo_rect.top = 30
                 screen.blit(self.logo_img, logo_rect)
@@ -174,81 +226,52 @@ class GameState:
             options = ['Play Game', 'Settings', 'Leave Game']
             if not hasattr(self, 'menu_index'):
                 self.menu_index = 0
-            option_font = pygame.font.SysFont(None, 48)
             y_start = logo_rect.bottom + 30 if self.logo_img else 250
             for i, opt in enumerate(options):
                 color = (255,255,200) if i == self.menu_index else (180,180,180)
-                opt_txt = option_font.render(opt, True, color)
-                screen.blit(opt_txt, (screen_width//2 - opt_txt.get_width()//2, y_start + i*70))
+                opt_txt = render_text(opt, 48, color)
+                screen.blit(opt_txt, (screen_width//2 - world_width(opt_txt)//2, y_start + i*70))
             # Instructions
-            instr_font = pygame.font.SysFont(None, 28)
-            instr = instr_font.render('Use arrows to navigate, ENTER to select', True, (220,220,220))
-            screen.blit(instr, (screen_width//2 - instr.get_width()//2, screen_height-60))
+            instr = render_text('Use arrows to navigate, ENTER to select', 28, (220,220,220))
+            screen.blit(instr, (screen_width//2 - world_width(instr)//2, screen_height-60))
         elif self.state == GameState.PAUSED:
-            # Animated background
-            if background:
-                background.update()
-                background.draw(screen)
-            else:
-                screen.fill((30, 30, 30))
             options = ['Resume Game', 'Settings', 'Go to Menu', 'Leave Game']
             if not hasattr(self, 'pause_index'):
                 self.pause_index = 0
-            title_font = pygame.font.SysFont(None, 64)
-            option_font = pygame.font.SysFont(None, 44)
-            title = title_font.render('PAUSED', True, (255,255,0))
-            screen.blit(title, (screen_width//2 - title.get_width()//2, 120))
+            title = render_text('PAUSED', 64, (255,255,0))
+            screen.blit(title, (screen_width//2 - world_width(title)//2, 120))
             for i, opt in enumerate(options):
                 color = (255,255,200) if i == self.pause_index else (180,180,180)
-                opt_txt = option_font.render(opt, True, color)
-                screen.blit(opt_txt, (screen_width//2 - opt_txt.get_width()//2, 230 + i*60))
-            instr_font = pygame.font.SysFont(None, 28)
-            instr = instr_font.render('Use arrows to navigate, ENTER to select', True, (220,220,220))
-            screen.blit(instr, (screen_width//2 - instr.get_width()//2, screen_height-60))
+                opt_txt = render_text(opt, 44, color)
+                screen.blit(opt_txt, (screen_width//2 - world_width(opt_txt)//2, 230 + i*60))
+            instr = render_text('Use arrows to navigate, ENTER to select', 28, (220,220,220))
+            screen.blit(instr, (screen_width//2 - world_width(instr)//2, screen_height-60))
         elif self.state == GameState.GAME_OVER:
-            # Animated background
-            if background:
-                background.update()
-                background.draw(screen)
-            else:
-                screen.fill((20,0,0))
             # GAME OVER
-            title_font = pygame.font.SysFont(None, 80)
-            title = title_font.render('GAME OVER', True, (255,50,50))
-            screen.blit(title, (screen_width//2 - title.get_width()//2, 100))
+            title = render_text('GAME OVER', 80, (255,50,50))
+            screen.blit(title, (screen_width//2 - world_width(title)//2, 100))
             # Kills and time survived
             kills = getattr(self, 'last_kills', 0)
             elapsed_time = getattr(self, 'last_time', 0)
-            info_font = pygame.font.SysFont(None, 44)
             min_ = elapsed_time // 60
             sec_ = elapsed_time % 60
-            time_txt = info_font.render(f"Tempo: {min_:02}:{sec_:02}", True, (255,255,255))
-            kills_txt = info_font.render(f"Kills: {kills}", True, (255,255,255))
-            screen.blit(time_txt, (screen_width//2 - time_txt.get_width()//2, 210))
-            screen.blit(kills_txt, (screen_width//2 - kills_txt.get_width()//2, 260))
+            time_txt = render_text(f"Tempo: {min_:02}:{sec_:02}", 44, (255,255,255))
+            kills_txt = render_text(f"Kills: {kills}", 44, (255,255,255))
+            screen.blit(time_txt, (screen_width//2 - world_width(time_txt)//2, 210))
+            screen.blit(kills_txt, (screen_width//2 - world_width(kills_txt)//2, 260))
             # Game over options
             options = ['Restart', 'Go to Menu', 'Leave Game']
             if not hasattr(self, 'gameover_index'):
                 self.gameover_index = 0
-            option_font = pygame.font.SysFont(None, 44)
             for i, opt in enumerate(options):
                 color = (255,255,200) if i == self.gameover_index else (180,180,180)
-                opt_txt = option_font.render(opt, True, color)
-                screen.blit(opt_txt, (screen_width//2 - opt_txt.get_width()//2, 340 + i*60))
-            instr_font = pygame.font.SysFont(None, 28)
-            instr = instr_font.render('Use arrows to navigate, ENTER to select', True, (220,220,220))
-            screen.blit(instr, (screen_width//2 - instr.get_width()//2, screen_height-60))
+                opt_txt = render_text(opt, 44, color)
+                screen.blit(opt_txt, (screen_width//2 - world_width(opt_txt)//2, 340 + i*60))
+            instr = render_text('Use arrows to navigate, ENTER to select', 28, (220,220,220))
+            screen.blit(instr, (screen_width//2 - world_width(instr)//2, screen_height-60))
         elif self.state == 'settings':
-            # Draw settings screen with animated background
-            if background:
-                background.update()
-                background.draw(screen)
-            else:
-                screen.fill((30, 30, 30))
-            title_font = pygame.font.SysFont(None, 72)
-            option_font = pygame.font.SysFont(None, 48)
-            title = title_font.render('SETTINGS', True, (255,255,255))
-            screen.blit(title, (screen_width//2 - title.get_width()//2, 100))
+            title = render_text('SETTINGS', 72, (255,255,255))
+            screen.blit(title, (screen_width//2 - world_width(title)//2, 100))
             options = ['Music', 'Music Volume', 'Back']
             values = ["On" if self.music_on else "Off", f"{int(self.music_volume*100)}%", ""]
             for i, opt in enumerate(options):
@@ -257,9 +280,7 @@ class GameState:
                     text = f"{opt}: {values[i]}"
                 else:
                     text = opt
-                opt_txt = option_font.render(text, True, color)
-                screen.blit(opt_txt, (screen_width//2 - opt_txt.get_width()//2, 240 + i*60))
-            instr_font = pygame.font.SysFont(None, 28)
-            instr = instr_font.render('Use arrows to change option/volume, ENTER to go back', True, (220,220,220))
-            screen.blit(instr, (screen_width//2 - instr.get_width()//2, screen_height-60))
-        return leave_game
\ No newline at end of file
+                opt_txt = render_text(text, 48, color)
+                screen.blit(opt_txt, (screen_width//2 - world_width(opt_txt)//2, 240 + i*60))
+            instr = render_text('Use arrows to change option/volume, ENTER to go back', 28, (220,220,220))
+            screen.blit(instr, (screen_width//2 - world_width(instr)//2, screen_height-60))
@@ -0,0 +1,112 @@
+"""
+Headless max-speed simulation.
+
+Runs the game simulation (update_game with the spawner, combat and effects)
+on the SDL dummy video and audio drivers: no window, no convert, no drawing
+and no frame limiting, so it advances as fast as the CPU allows. Meant for
+long automated runs on servers without a display:
+
+    python headless.py --seconds 3600
+
+When the player dies a new session starts, so a run always covers the
+requested simulated time. Each step is one 1/FPS tick of game time.
+
+With --seed the sessions are seeded from it (seed, seed + 1, ...), so two runs
+give the same result. With --replay a recorded session (see replay.py) is
+played back step for step instead:
+
+    python headless.py --replay replay.bin
+"""
+import os
+
+# Before anything imports pygame: no display and no sound device needed
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+import argparse
+import time
+import pygame
+from settings import FPS
+from effects import Effects
+from game_state import GameState
+from asset_registry import registry
+from asset_pack import AssetPack
+from lifecycle import format_stats as format_lifecycle_stats
+from pool import format_stats as format_pool_stats
+from spatial_hash import format_stats as format_collision_stats
+from combat import format_stats as format_combat_stats
+from game_sounds import sound_bank, format_stats as format_sound_stats
+from replay import Recording, input_driver
+from session import reset_session, enemy_swarm
+from main import update_game
+
+
+def run(steps, seed=None, recording=None):
+    # Simulates `steps` ticks back to back (a replay: the recorded ones, in a
+    # single session); returns the run's figures
+    pygame.init()  # Dummy drivers: key state and timers, no window
+    registry.use_pack(AssetPack.open())
+    game_state = GameState()
+    game_state.set_state(GameState.PLAYING)
+    effects = Effects()
+    if recording is not None:
+        steps = recording.steps
+    player, spawner, enemies, potions, grenades, kills = reset_session(effects, seed=seed, recording=recording)
+    total_kills = 0
+    sessions = 1
+    done = 0
+    start = time.perf_counter()
+    while done < steps:
+        update_game(player, spawner, enemies, kills, game_state, effects, potions, grenades)
+        sound_bank.next_frame()
+        effects.update()
+        done += 1
+        if player.hp <= 0:
+            if recording is not None:
+                break
+            if seed is not None:
+                seed += 1
+            total_kills += kills[0]
+            player, spawner, enemies, potions, grenades, kills = reset_session(effects, player, seed)
+            game_state.set_state(GameState.PLAYING)
+            sessions += 1
+    wall_time = time.perf_counter() - start
+    return {
+        'steps': done,
+        'simulated': done / FPS,
+        'wall': wall_time,
+        'speed': done / FPS / wall_time if wall_time else float('inf'),
+        'kills': total_kills + kills[0],
+        'sessions': sessions,
+        'seed': input_driver.seed,
+        'hp': player.hp,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game simulation headless, as fast as possible")
+    parser.add_argument('--seconds', type=float, default=600, help="simulated game time to run")
+    parser.add_argument('--seed', type=int, help="seed of the first session, for reproducible runs")
+    parser.add_argument('--replay', help="play back a recorded session instead (see replay.py)")
+    args = parser.parse_args()
+
+    recording = Recording.load(args.replay) if args.replay else None
+    result = run(int(args.seconds * FPS), seed=args.seed, recording=recording)
+    if recording is not None:
+        print(f"Replayed {args.replay} (seed {result['seed']}): {result['steps']} of {recording.steps} steps, "
+              f"player hp {result['hp']} at the end")
+    print(f"Simulated {result['simulated']:.0f} s ({result['steps']} steps) in {result['wall']:.2f} s: "
+          f"{result['speed']:.1f} simulated seconds per second")
+    print(f"{result['kills']} kills over {result['sessions']} sessions")
+    print(format_lifecycle_stats())
+    if enemy_swarm is not None:
+        from swarm import format_stats as format_swarm_stats
+        print(format_swarm_stats())
+    print(format_pool_stats())
+    print(format_collision_stats())
+    print(format_combat_stats())
+    print(format_sound_stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,34 +1,40 @@
 import os
 import pygame
 from settings import SCREEN_HEIGHT
+from asset_registry import get_frames
+from render_queue import LAYER_POTIONS
+from culling import viewport
+from lifecycle import ALIVE, RETIRED
 
 class HealthPotion:
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
         self.width = 40
         self.height = 40
-        self.vel_y = 0  # Initial vertical velocity
         self.gravity = 0.5  # Gravity to simulate falling
         self.ground_y = SCREEN_HEIGHT - 150  # Ground position
         self.frames = []
-        self.current_frame = 0
         self.animation_speed = 0.1
+        self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.reset(x, y)
+        self.load_frames()
+
+    def reset(self, x, y):
+        #Per-drop state, set again when a pooled potion is reused.
+        self.x = x
+        self.y = y
+        self.vel_y = 0  # Initial vertical velocity
+        self.current_frame = 0
         self.animation_counter = 0
         self.active = True  # If False, the potion has been collected
         self.collectable = False  # If True, the potion can be collected (after hitting the ground)
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        self.load_frames()
+        self.rect.update(x, y, self.width, self.height)
         
     def load_frames(self):
         #Loads the health potion animation frames.
         try:
             potion_dir = os.path.join('assets', 'effects', 'health_potion')
-            for i in range(1, 5):  # 4 animation frames
-                path = os.path.join(potion_dir, f'hpot_{i}.png')
-                img = pygame.image.load(path).convert_alpha()
-                img = pygame.transform.scale(img, (self.width, self.height))
-                self.frames.append(img)
+            paths = [os.path.join(potion_dir, f'hpot_{i}.png') for i in range(1, 5)]  # 4 animation frames
+            self.frames = get_frames(paths, size=(self.width, self.height))
         except Exception as e:
             print(f"Error loading health potion frames: {e}")
     
@@ -59,13 +65,15 @@ class HealthPotion:
             self.current_frame = (self.current_frame + 1) % len(self.frames)
             self.animation_counter = 0
     
-    def draw(self, surface):
-        #Draws the potion on the screen.
+    def draw(self, queue):
+        #Submits the potion to the render queue.
         if not self.active or not self.frames:
             return
         
         # Draw the potion
-        surface.blit(self.frames[self.current_frame], (self.x, self.y))
+        image = self.frames[self.current_frame]
+        if viewport.visible_at(image, (self.x, self.y)):
+            queue.submit(image, (self.x, self.y), LAYER_POTIONS)
     
     def collect(self):
         #Marks the potion as collected.
@@ -75,6 +83,10 @@ class HealthPotion:
         self.active = False
         return 20  # Amount of health the potion restores
         
+    def lifecycle_phase(self):
+        #Collected potions are retired.
+        return ALIVE if self.active else RETIRED
+
     def can_collect(self):
         #Checks if the potion can be collected.
         return self.active and self.collectable
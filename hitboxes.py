@@ -1,12 +1,17 @@
 import pygame
 
+# Enemy body hitbox, relative to the top-left corner of the enemy sprite.
+# Shared by get_enemy_hitbox, Enemy.rect, the spatial hash and the swarm.
+ENEMY_HITBOX_OFFSET = (30, 40)
+ENEMY_HITBOX_SIZE = (100, 120)
+
 def get_player_hitbox(player):
     # Centralized on body
     return pygame.Rect(player.x + 40, player.y + 40, 100, 120)
 
 def get_enemy_hitbox(enemy):
     # Centralized on body
-    return pygame.Rect(enemy.x + 30, enemy.y + 40, 100, 120)
+    return pygame.Rect(enemy.x + ENEMY_HITBOX_OFFSET[0], enemy.y + ENEMY_HITBOX_OFFSET[1], *ENEMY_HITBOX_SIZE)
 
 def get_attack_hitbox(player):
     # Hitbox of player's attack (in front)
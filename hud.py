@@ -1,263 +1,441 @@
 import pygame
+from asset_registry import get_image
+from text_cache import render_text
+from pulse import get_pulse, pulse_frame, pulse_frames
+from renderer import union_rects
+from render_scale import world_width, world_height, world_size, to_render_size, draw_rect, make_layer
+from settings import SCREEN_WIDTH
+from alpha_cache import alpha_cache, faded
+from render_queue import LAYER_POPUPS
+from culling import viewport
+from pool import Pool, pools
+
+HUD_STATS_RECT = pygame.Rect(20, 20, 560, 90)  # Area of the health/mana/time/kills panel
 
 # Draw health bar with text (for player or enemy)
 def draw_health_bar(surface, x, y, w, h, hp, max_hp):
     fill = int(w * (hp / max_hp))
     # Red bar
-    pygame.draw.rect(surface, (80,0,0), (x, y, w, h))
-    pygame.draw.rect(surface, (220,20,40), (x, y, fill, h))
-    pygame.draw.rect(surface, (60,0,0), (x, y, w, h), 3)
+    rect = draw_rect(surface, (80,0,0), (x, y, w, h))
+    draw_rect(surface, (220,20,40), (x, y, fill, h))
+    draw_rect(surface, (60,0,0), (x, y, w, h), 3)
     # HP text
-    font = pygame.font.SysFont(None, int(h*1.1))
-    text = font.render(f"{int(hp)}/{int(max_hp)}", True, (255,255,255))
-    surface.blit(text, (x + w//2 - text.get_width()//2, y + h//2 - text.get_height()//2))
+    text = render_text(f"{int(hp)}/{int(max_hp)}", int(h*1.1), (255,255,255))
+    return rect.union(surface.blit(text, (x + w//2 - world_width(text)//2, y + h//2 - world_height(text)//2)))
+
+# Prerendered health bars shared by every enemy: (hp, max_hp, w, h) -> (sprite, offset).
+# The offset is where the sprite goes relative to the bar's top-left, since the
+# HP text can stick out of the bar.
+health_bar_sprites = {}
+health_bar_stats = {'hits': 0, 'misses': 0}
+
+def health_bar_sprite(hp, max_hp, w, h):
+    key = (hp, max_hp, w, h)
+    cached = health_bar_sprites.get(key)
+    if cached is not None:
+        health_bar_stats['hits'] += 1
+        return cached
+    health_bar_stats['misses'] += 1
+    text = render_text(f"{int(hp)}/{int(max_hp)}", int(h*1.1), (255,255,255))
+    text_rect = pygame.Rect((0, 0), world_size(text))
+    text_rect.topleft = (w//2 - text_rect.width//2, h//2 - text_rect.height//2)
+    bounds = text_rect.union((0, 0, w, h))
+    sprite = make_layer(bounds.size)
+    draw_health_bar(sprite, -bounds.x, -bounds.y, w, h, hp, max_hp)
+    cached = health_bar_sprites[key] = (sprite, bounds.topleft)
+    return cached
 
 # Draw mana bar with text
 def draw_mana_bar(surface, x, y, w, h, mana, max_mana):
     fill = int(w * (mana / max_mana))
     # Blue bar
-    pygame.draw.rect(surface, (30,30,80), (x, y, w, h))
-    pygame.draw.rect(surface, (80,120,255), (x, y, fill, h))
-    pygame.draw.rect(surface, (20,20,60), (x, y, w, h), 3)
+    rect = draw_rect(surface, (30,30,80), (x, y, w, h))
+    draw_rect(surface, (80,120,255), (x, y, fill, h))
+    draw_rect(surface, (20,20,60), (x, y, w, h), 3)
     # Mana text
-    font = pygame.font.SysFont(None, int(h*1.1))
-    text = font.render(f"{int(mana)}/{int(max_mana)}", True, (220,220,255))
-    surface.blit(text, (x + w//2 - text.get_width()//2, y + h//2 - text.get_height()//2))
+    text = render_text(f"{int(mana)}/{int(max_mana)}", int(h*1.1), (220,220,255))
+    return rect.union(surface.blit(text, (x + w//2 - world_width(text)//2, y + h//2 - world_height(text)//2)))
+
+# Damage popups are pooled lists: [text, x, y, alpha, timer, type]
+def new_popup(text, x, y, alpha, timer, kind):
+    return [text, x, y, alpha, timer, kind]
+
+def reset_popup(popup, text, x, y, alpha, timer, kind):
+    popup[0] = text
+    popup[1] = x
+    popup[2] = y
+    popup[3] = alpha
+    popup[4] = timer
+    popup[5] = kind
+
+popup_pool = pools.setdefault('popups', Pool('popups', new_popup, reset_popup))
 
-# Utility to update and remove expired damage popups
+def add_popup(popups, text, x, y, kind):
+    popups.append(popup_pool.acquire(text, x, y, 255, 0, kind))
+
+def release_popups(popups):
+    for popup in popups:
+        popup_pool.release(popup)
+    popups.clear()
+
+# Utility to update and remove expired damage popups (compacted in place, so
+# each expired list goes back to the pool exactly once)
 def update_damage_popups(popups):
-    for popup in popups[:]:
+    kept = 0
+    for popup in popups:
         try:
             popup[2] -= 1  # Move the popup upward
             popup[3] = max(0, popup[3]-8)  # Reduce alpha (transparency)
             popup[4] += 1  # Increment timer
-            if popup[3] <= 0 or popup[4] > 40:
-                popups.remove(popup)
+            expired = popup[3] <= 0 or popup[4] > 40
         except Exception as e:
             # If there's any error, remove the problematic popup
-            if popup in popups:
-                popups.remove(popup)
-
-# Draw damage popups
-font = None
-def draw_damage_popups(surface, popups):
-    global font
-    if font is None:
-        font = pygame.font.SysFont('arial', 26, bold=True)
+            expired = True
+        if expired:
+            popup_pool.release(popup)
+        else:
+            popups[kept] = popup
+            kept += 1
+    del popups[kept:]
+
+# Popup type -> (text color, prefix). Damage is red, healing green and mana
+# blue; healing and mana gain get a '+' before the value
+POPUP_STYLES = {
+    "damage": ((255, 0, 0), ""),
+    "heal": ((0, 255, 0), "+"),
+    "mana": ((0, 100, 255), "+"),
+}
+POPUP_FONT = ('arial', 26, True)  # name, size, bold
+POPUP_GLYPHS = '0123456789+'
+
+
+# --- Glyph atlas: digits and '+' pre-rendered once per popup color ---
+class GlyphAtlas:
+    def __init__(self, color, chars=POPUP_GLYPHS, font=POPUP_FONT):
+        self.color = color
+        self.font = font
+        name, size, bold = font
+        self.glyphs = {char: render_text(char, size, color, name, bold) for char in chars}
+        self.widths = {char: world_width(glyph) for char, glyph in self.glyphs.items()}
+        self.height = max(world_height(glyph) for glyph in self.glyphs.values())
+
+    def text_width(self, text):
+        return sum(self.widths[char] for char in text)
+
+    def submit(self, queue, text, center_x, y, alpha, layer=LAYER_POPUPS):
+        # Queues the string glyph by glyph at the given alpha. The faded glyphs
+        # come from the alpha cache, so batched blits can share them.
+        if any(char not in self.glyphs for char in text):
+            # Rare text outside the atlas: fall back to the text cache
+            name, size, bold = self.font
+            image = faded(render_text(text, size, self.color, name, bold), alpha)
+            if image is not None:
+                queue.submit(image, (center_x - world_width(image)//2, y), layer)
+            return
+        x = center_x - self.text_width(text)//2
+        for char in text:
+            glyph = faded(self.glyphs[char], alpha)
+            if glyph is not None:
+                queue.submit(glyph, (x, y), layer)
+            x += self.widths[char]
+
+    def prebuild(self):
+        for glyph in self.glyphs.values():
+            alpha_cache.prebuild(glyph)
+
+
+# Popup type -> GlyphAtlas, built on first use (or by load_popup_atlases at startup)
+popup_atlases = {}
+
+def load_popup_atlases():
+    for popup_type, (color, _) in POPUP_STYLES.items():
+        if popup_type not in popup_atlases:
+            popup_atlases[popup_type] = GlyphAtlas(color)
+            popup_atlases[popup_type].prebuild()
+
+# Queue damage popups (drawn above every entity, in LAYER_POPUPS)
+def draw_damage_popups(queue, popups):
+    if not popups:
+        return
+    if len(popup_atlases) < len(POPUP_STYLES):
+        load_popup_atlases()
     for popup in popups:
         if len(popup) >= 6:
             # Popup format: [value, x, y, alpha, timer, type]
             dmg, x, y, alpha, timer, popup_type = popup
-            
-            # Define the color based on the popup type (damage, heal, or mana)
-            if popup_type == "heal":
-                # Green for heal
-                color = (0, 255, 0)
-                # Adds a '+' before the value to indicate healing
-                text = font.render("+" + str(dmg), True, color)
-            elif popup_type == "mana":
-                # Blue for mana
-                color = (0, 100, 255)
-                # Adds a '+' before the value to indicate mana gain
-                text = font.render("+" + str(dmg), True, color)
-            else:
-                # Red for damage
-                color = (255, 0, 0)
-                text = font.render(str(dmg), True, color)
         else:
-            # Old popup format: [value, x, y, alpha, timer]
+            # Old popup format: [value, x, y, alpha, timer], drawn as damage
             dmg, x, y, alpha, timer = popup
-            # Red for damage (default behavior)
-            color = (255, 0, 0)
-            text = font.render(str(dmg), True, color)
-            
-        text.set_alpha(alpha)
-        surface.blit(text, (x - text.get_width()//2, y))
+            popup_type = "damage"
+        if popup_type not in POPUP_STYLES:
+            popup_type = "damage"
+        text = POPUP_STYLES[popup_type][1] + str(dmg)
+        atlas = popup_atlases[popup_type]
+        width = atlas.text_width(text) if all(char in atlas.widths for char in text) else 100
+        if viewport.visible((x - width//2, y, width, atlas.height)):
+            atlas.submit(queue, text, x, y, alpha)
 
 # Dictionary to store skill icons (loaded once)
 skill_icons = {}
 
+# Pulsating effect of ready skill icons: scale 0.9-1.1 in 0.005 steps per frame
+SKILL_ICON_PULSE = get_pulse(0.005, 0.1)
+
 # Dictionary to store animation state for each skill icon
 skill_animations = {
     'ultimate': {
-        'scale': 1.0,
-        'scale_direction': 0.005,  # Amount to increase/decrease scale each frame
+        'pulse_phase': 0,  # Position in SKILL_ICON_PULSE
         'float_offset': 0,
         'float_direction': 0.3,  # Pixels to move up/down per frame
     },
     'grenade': {
-        'scale': 1.0,
-        'scale_direction': 0.005,
+        'pulse_phase': 0,
         'float_offset': 0,
         'float_direction': 0.3,
     }
 }
 
-# Draw skill icons in the HUD
-def draw_skill_icons(surface, player):
-    # Draw skill icons in the center top of the screen
-    # Each icon shows a different skill and its cooldown status
-    
-    # Define icon size and spacing (30% larger than before)
-    icon_size = (100, 100)  # Increased size by 30% (from 60x60)
-    icon_spacing = 20  # Space between icons
-    
+# Load the ready/not ready icons for each skill (only the first call touches the registry)
+def load_skill_icons(icon_size=(100, 100)):
     # Load grenade icons if not already loaded
     if 'grenade_ready' not in skill_icons or 'grenade_not_ready' not in skill_icons:
         try:
-            # Load the ready and not ready images for grenade
-            ready_img = pygame.image.load('assets/effects/grenade/granada_ready.png').convert_alpha()
-            not_ready_img = pygame.image.load('assets/effects/grenade/grenade_not_ready.png').convert_alpha()
-            
-            # Scale them to our icon size
-            skill_icons['grenade_ready'] = pygame.transform.scale(ready_img, icon_size)
-            skill_icons['grenade_not_ready'] = pygame.transform.scale(not_ready_img, icon_size)
+            # Load the ready and not ready images for grenade, scaled to our icon size
+            skill_icons['grenade_ready'] = get_image('assets/effects/grenade/granada_ready.png', size=icon_size)
+            skill_icons['grenade_not_ready'] = get_image('assets/effects/grenade/grenade_not_ready.png', size=icon_size)
         except Exception as e:
             print(f"Error loading grenade icons: {e}")
             # Create fallback icons
-            fallback_ready = pygame.Surface(icon_size, pygame.SRCALPHA)
-            fallback_not_ready = pygame.Surface(icon_size, pygame.SRCALPHA)
-            pygame.draw.rect(fallback_ready, (0, 255, 0), (0, 0, icon_size[0], icon_size[1]))
-            pygame.draw.rect(fallback_not_ready, (255, 0, 0), (0, 0, icon_size[0], icon_size[1]))
+            fallback_size = to_render_size(icon_size)
+            fallback_ready = pygame.Surface(fallback_size, pygame.SRCALPHA)
+            fallback_not_ready = pygame.Surface(fallback_size, pygame.SRCALPHA)
+            pygame.draw.rect(fallback_ready, (0, 255, 0), (0, 0, fallback_size[0], fallback_size[1]))
+            pygame.draw.rect(fallback_not_ready, (255, 0, 0), (0, 0, fallback_size[0], fallback_size[1]))
             skill_icons['grenade_ready'] = fallback_ready
             skill_icons['grenade_not_ready'] = fallback_not_ready
     
     # Load ultimate icons if not already loaded
     if 'ultimate_ready' not in skill_icons or 'ultimate_not_ready' not in skill_icons:
         try:
-            # Load the ready and not ready images for ultimate
-            ready_img = pygame.image.load('assets/effects/ultimate_hud/ult_ready_hud.png').convert_alpha()
-            not_ready_img = pygame.image.load('assets/effects/ultimate_hud/ult_not_ready_hud.png').convert_alpha()
-            
-            # Scale them to our icon size
-            skill_icons['ultimate_ready'] = pygame.transform.scale(ready_img, icon_size)
-            skill_icons['ultimate_not_ready'] = pygame.transform.scale(not_ready_img, icon_size)
+            # Load the ready and not ready images for ultimate, scaled to our icon size
+            skill_icons['ultimate_ready'] = get_image('assets/effects/ultimate_hud/ult_ready_hud.png', size=icon_size)
+            skill_icons['ultimate_not_ready'] = get_image('assets/effects/ultimate_hud/ult_not_ready_hud.png', size=icon_size)
         except Exception as e:
             print(f"Error loading ultimate icons: {e}")
             # Create fallback icons
-            fallback_ready = pygame.Surface(icon_size, pygame.SRCALPHA)
-            fallback_not_ready = pygame.Surface(icon_size, pygame.SRCALPHA)
-            pygame.draw.rect(fallback_ready, (255, 255, 255), (0, 0, icon_size[0], icon_size[1]))
-            pygame.draw.rect(fallback_not_ready, (100, 100, 100), (0, 0, icon_size[0], icon_size[1]))
+            fallback_size = to_render_size(icon_size)
+            fallback_ready = pygame.Surface(fallback_size, pygame.SRCALPHA)
+            fallback_not_ready = pygame.Surface(fallback_size, pygame.SRCALPHA)
+            pygame.draw.rect(fallback_ready, (255, 255, 255), (0, 0, fallback_size[0], fallback_size[1]))
+            pygame.draw.rect(fallback_not_ready, (100, 100, 100), (0, 0, fallback_size[0], fallback_size[1]))
             skill_icons['ultimate_ready'] = fallback_ready
             skill_icons['ultimate_not_ready'] = fallback_not_ready
     
+    # Pre-build the pulse frames of the ready icons
+    for name in ('grenade_ready', 'ultimate_ready'):
+        pulse_frames.cycle(skill_icons[name], SKILL_ICON_PULSE)
+
+# Skill icon layout, in world units
+SKILL_ICON_SIZE = (100, 100)  # Increased size by 30% (from 60x60)
+SKILL_ICON_SPACING = 20  # Space between icons
+SKILL_ICON_Y = 20  # 20px from top
+# The cooldown overlay shrinks in this many steps, so the skills layer is
+# rebuilt a few times per second instead of every frame
+COOLDOWN_BUCKETS = 20
+
+
+# --- Retained HUD layer: a cached panel surface redrawn only when its inputs change ---
+class HudLayer:
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)  # Screen area in world units
+        self.surface = make_layer(self.rect.size)
+        self.signature = None
+        self.rebuilds = 0
+        self.frames = 0
+
+    def needs_redraw(self, signature):
+        # True (with the layer cleared) when the panel must be drawn again;
+        # draw at positions relative to self.rect
+        self.frames += 1
+        if signature == self.signature:
+            return False
+        self.signature = signature
+        self.rebuilds += 1
+        self.surface.fill((0, 0, 0, 0))
+        return True
+
+    def blit(self, surface):
+        return surface.blit(self.surface, self.rect.topleft)
+
+
+# Name -> HudLayer, created on first draw
+hud_layers = {}
+
+def get_layer(name, rect):
+    layer = hud_layers.get(name)
+    if layer is None or layer.rect != rect:
+        layer = hud_layers[name] = HudLayer(rect)
+    return layer
+
+
+def skill_states(player):
     # List of skills: (skill_name, current_cooldown, max_cooldown, has_enough_mana, key)
-    skills = [
+    return [
         ('ultimate', player.ultimate_cooldown, 300, player.mana >= player.max_mana, 'X'),  # Ultimate - X key
         ('grenade', player.grenade_cooldown, player.grenade_cooldown_max, player.mana >= player.grenade_mana_cost, 'Q')  # Grenade - Q key
     ]
+
+
+def cooldown_bucket(cooldown, max_cooldown):
+    if cooldown <= 0:
+        return 0
+    return min(COOLDOWN_BUCKETS, -(-cooldown * COOLDOWN_BUCKETS // max_cooldown))
+
+
+def draw_skill(surface, skill_name, key, is_ready, bucket, icon_x, icon_y, phase):
+    # Draws one skill icon, its cooldown overlay and its key label. Returns the drawn rects.
+    icon_size = SKILL_ICON_SIZE
+    rects = []
     
-    # Calculate total width of all icons plus spacing
-    total_width = len(skills) * icon_size[0] + (len(skills) - 1) * icon_spacing
-    
-    # Center horizontally, position at top with some margin
-    start_x = (surface.get_width() - total_width) // 2
-    base_icon_y = 20  # 20px from top
+    # Select the appropriate icon
+    icon = skill_icons[skill_name + '_ready'] if is_ready else skill_icons[skill_name + '_not_ready']
     
-    # Draw each skill icon
-    for i, (skill_name, cooldown, max_cooldown, has_mana, key) in enumerate(skills):
-        # Update animation state
-        if skill_name not in skill_animations:
-            skill_animations[skill_name] = {
-                'scale': 1.0,
-                'scale_direction': 0.005,
-                'float_offset': 0,
-                'float_direction': 0.3,
-            }
+    # Apply scale animation if ready
+    if is_ready:
+        # Pre-scaled frame of the pulse cycle
+        scaled_icon = pulse_frame(icon, SKILL_ICON_PULSE, phase)
+        scaled_size = world_size(scaled_icon)
+        
+        # Adjust position to keep icon centered after scaling
+        scaled_x = icon_x - (scaled_size[0] - icon_size[0]) // 2
+        scaled_y = icon_y - (scaled_size[1] - icon_size[1]) // 2
         
-        # Get animation state
-        anim = skill_animations[skill_name]
+        # Draw the scaled icon
+        rects.append(surface.blit(scaled_icon, (scaled_x, scaled_y)))
+    else:
+        # Draw the regular icon without animation
+        rects.append(surface.blit(icon, (icon_x, icon_y)))
+        
+        # Draw cooldown overlay on top if needed (from the top, at the render resolution like the icons)
+        if bucket > 0:
+            overlay_size = to_render_size(icon_size)
+            cooldown_overlay = pygame.Surface(overlay_size, pygame.SRCALPHA)
+            cooldown_height = overlay_size[1] * bucket // COOLDOWN_BUCKETS
+            pygame.draw.rect(cooldown_overlay, (100, 100, 100, 150), (0, 0, overlay_size[0], cooldown_height))
+            surface.blit(cooldown_overlay, (icon_x, icon_y))
+    
+    # Draw key text below the icon (smaller font for key indicators, white text)
+    key_text = render_text(key, 28, (255, 255, 255))
+    
+    # Position the text centered below the icon
+    text_x = icon_x + (icon_size[0] // 2) - (world_width(key_text) // 2)
+    text_y = icon_y + icon_size[1] + 5  # 5px below the icon
+    
+    # Draw a small dark background for better visibility
+    text_bg_rect = pygame.Rect(text_x - 5, text_y - 2, world_width(key_text) + 10, world_height(key_text) + 4)
+    rects.append(draw_rect(surface, (0, 0, 0), text_bg_rect, border_radius=5))
+    
+    # Draw the text
+    rects.append(surface.blit(key_text, (text_x, text_y)))
+    return rects
+
+def skill_animation(skill_name):
+    return skill_animations.setdefault(skill_name, {
+        'pulse_phase': 0,
+        'float_offset': 0,
+        'float_direction': 0.3,
+    })
+
+# Advance the skill icons' pulse and float, once per simulation step
+# (draw_skill_icons only reads them)
+def update_skill_icons(player):
+    for skill_name, _, _, _, _ in skill_states(player):
+        anim = skill_animation(skill_name)
         
-        # Update scale (pulsating effect)
-        anim['scale'] += anim['scale_direction']
-        if anim['scale'] > 1.1 or anim['scale'] < 0.9:
-            anim['scale_direction'] *= -1  # Reverse direction
+        # Advance the pulsating effect
+        anim['pulse_phase'] = (anim['pulse_phase'] + 1) % len(SKILL_ICON_PULSE)
         
         # Update float offset (floating effect)
         anim['float_offset'] += anim['float_direction']
         if abs(anim['float_offset']) > 3:  # Limit the float range
             anim['float_direction'] *= -1  # Reverse direction
+
+# Draw skill icons in the HUD
+def draw_skill_icons(surface, player):
+    # Draw skill icons in the center top of the screen
+    # Each icon shows a different skill and its cooldown status. Icons that
+    # aren't ready are static and come from the cached skills layer; ready
+    # icons pulse and float, so they are drawn every frame.
+    # Returns the bounding rect of everything drawn.
+    
+    # Load the icons on first use (normally done up front by the startup warmup)
+    load_skill_icons(SKILL_ICON_SIZE)
+    skills = skill_states(player)
+    
+    # Calculate total width of all icons plus spacing
+    total_width = len(skills) * SKILL_ICON_SIZE[0] + (len(skills) - 1) * SKILL_ICON_SPACING
+    
+    # Center horizontally, position at top with some margin
+    start_x = (SCREEN_WIDTH - total_width) // 2
+    
+    states = []
+    for i, (skill_name, cooldown, max_cooldown, has_mana, key) in enumerate(skills):
+        # Get animation state (advanced by update_skill_icons)
+        anim = skill_animation(skill_name)
         
         # Apply animation only if the skill is ready
         is_ready = cooldown <= 0 and has_mana
-        
-        # Calculate position with animation
-        icon_x = start_x + i * (icon_size[0] + icon_spacing)
-        icon_y = base_icon_y
-        
-        # Apply floating animation if ready
-        if is_ready:
-            icon_y += anim['float_offset']
-        
-        # Create a cooldown overlay if needed
-        if cooldown > 0:
-            # Draw cooldown overlay
-            cooldown_overlay = pygame.Surface(icon_size, pygame.SRCALPHA)
-            cooldown_height = int(icon_size[1] * (cooldown / max_cooldown))
-            cooldown_y = 0  # Start from top
-            pygame.draw.rect(cooldown_overlay, (100, 100, 100, 150), (0, cooldown_y, icon_size[0], cooldown_height))
-        
-        # Select the appropriate icon
-        if skill_name == 'grenade':
-            icon = skill_icons['grenade_ready'] if is_ready else skill_icons['grenade_not_ready']
-        elif skill_name == 'ultimate':
-            icon = skill_icons['ultimate_ready'] if is_ready else skill_icons['ultimate_not_ready']
-        else:
-            continue  # Skip unknown skills
-        
-        # Apply scale animation if ready
+        icon_x = start_x + i * (SKILL_ICON_SIZE[0] + SKILL_ICON_SPACING)
+        states.append((skill_name, key, is_ready, cooldown_bucket(cooldown, max_cooldown), icon_x, anim))
+    
+    # Static icons: redrawn into the layer only when readiness or the cooldown step changes
+    layer = get_layer('skills', pygame.Rect(start_x - 10, SKILL_ICON_Y - 10, total_width + 20, SKILL_ICON_SIZE[1] + 50))
+    if layer.needs_redraw(tuple((name, is_ready, bucket) for name, _, is_ready, bucket, _, _ in states)):
+        for skill_name, key, is_ready, bucket, icon_x, anim in states:
+            if not is_ready:
+                draw_skill(layer.surface, skill_name, key, False, bucket,
+                           icon_x - layer.rect.x, SKILL_ICON_Y - layer.rect.y, 0)
+    rects = [layer.blit(surface)]
+    
+    # Animated icons: floating and pulsating
+    for skill_name, key, is_ready, bucket, icon_x, anim in states:
         if is_ready:
-            # Calculate scaled dimensions
-            scaled_size = (int(icon_size[0] * anim['scale']), int(icon_size[1] * anim['scale']))
-            
-            # Scale the icon
-            scaled_icon = pygame.transform.scale(icon, scaled_size)
-            
-            # Adjust position to keep icon centered after scaling
-            scaled_x = icon_x - (scaled_size[0] - icon_size[0]) // 2
-            scaled_y = icon_y - (scaled_size[1] - icon_size[1]) // 2
-            
-            # Draw the scaled icon
-            surface.blit(scaled_icon, (scaled_x, scaled_y))
-        else:
-            # Draw the regular icon without animation
-            surface.blit(icon, (icon_x, icon_y))
-            
-            # Draw cooldown overlay on top if needed
-            if cooldown > 0:
-                surface.blit(cooldown_overlay, (icon_x, icon_y))
-        
-        # Draw key text below the icon
-        font = pygame.font.SysFont(None, 28)  # Smaller font for key indicators
-        key_text = font.render(key, True, (255, 255, 255))  # White text
-        
-        # Position the text centered below the icon
-        text_x = icon_x + (icon_size[0] // 2) - (key_text.get_width() // 2)
-        text_y = icon_y + icon_size[1] + 5  # 5px below the icon
-        
-        # Draw a small dark background for better visibility
-        text_bg_rect = pygame.Rect(text_x - 5, text_y - 2, key_text.get_width() + 10, key_text.get_height() + 4)
-        pygame.draw.rect(surface, (0, 0, 0, 150), text_bg_rect, border_radius=5)
-        
-        # Draw the text
-        surface.blit(key_text, (text_x, text_y))
+            rects.extend(draw_skill(surface, skill_name, key, True, bucket,
+                                    icon_x, SKILL_ICON_Y + anim['float_offset'], anim['pulse_phase']))
+    return union_rects(rects)
 
-# --- Main function to draw the game HUD (health, mana, time, kills) ---
-def draw_hud(surface, player, elapsed_time, kills):
+# Health, mana, time and kills, with the health bar's top-left corner at (x, y)
+def draw_stats(surface, x, y, player, elapsed_time, kills):
     # Health
-    draw_health_bar(surface, 30, 30, 200, 22, player.hp, player.max_hp)
+    draw_health_bar(surface, x, y, 200, 22, player.hp, player.max_hp)
     # Mana
-    draw_mana_bar(surface, 30, 62, 200, 18, player.mana, player.max_mana)
+    draw_mana_bar(surface, x, y + 32, 200, 18, player.mana, player.max_mana)
     # Time
-    font = pygame.font.SysFont(None, 32)
     min_ = elapsed_time // 60
     sec_ = elapsed_time % 60
-    time_txt = font.render(f"Time alive: {min_:02}:{sec_:02}", True, (255,255,255))
-    surface.blit(time_txt, (260, 30))
+    time_txt = render_text(f"Time alive: {min_:02}:{sec_:02}", 32, (255,255,255))
+    surface.blit(time_txt, (x + 230, y))
     # Kills
-    kills_txt = font.render(f"Kills: {kills}", True, (255,255,255))
-    surface.blit(kills_txt, (260, 62))
+    kills_txt = render_text(f"Kills: {kills}", 32, (255,255,255))
+    surface.blit(kills_txt, (x + 230, y + 32))
+
+# --- Main function to draw the game HUD (health, mana, time, kills) ---
+def draw_hud(surface, player, elapsed_time, kills):
+    # The stats panel is a cached layer, rebuilt only when hp, mana, kills or
+    # the whole seconds change. Returns the rects drawn.
+    layer = get_layer('stats', HUD_STATS_RECT)
+    if layer.needs_redraw((player.hp, player.max_hp, player.mana, player.max_mana, elapsed_time, kills)):
+        draw_stats(layer.surface, 30 - layer.rect.x, 30 - layer.rect.y, player, elapsed_time, kills)
+    rects = [layer.blit(surface)]
     
     # Draw skill icons
-    draw_skill_icons(surface, player)
\ No newline at end of file
+    rects.append(draw_skill_icons(surface, player))
+    return rects
+
+
+def format_stats():
+    parts = [f"{name} {layer.rebuilds} rebuilds in {layer.frames} frames" for name, layer in hud_layers.items()]
+    lookups = health_bar_stats['hits'] + health_bar_stats['misses']
+    hit_rate = health_bar_stats['hits'] / lookups * 100 if lookups else 0.0
+    return ("HUD layers: " + (", ".join(parts) if parts else "not drawn")
+            + f"\nHealth bars: {len(health_bar_sprites)} sprites, {hit_rate:.1f}% hit rate")
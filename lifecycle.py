@@ -0,0 +1,93 @@
+from collections import Counter
+from pool import release
+
+# Lifecycle states. An entity is SPAWNING until its first reap, then asks
+# itself (lifecycle_phase()) whether it is ALIVE, DYING (still animating out)
+# or RETIRED (nothing left to update or draw).
+SPAWNING = 'spawning'
+ALIVE = 'alive'
+DYING = 'dying'
+RETIRED = 'retired'
+
+
+# --- Lifecycle manager: owns one kind of entity and drops the retired ones ---
+class Lifecycle:
+    def __init__(self, name, release=None):
+        self.name = name
+        self.release = release  # Called with each retired entity (e.g. back to its pool)
+        self.entities = []  # Live entities, in spawn order
+        self.phases = Counter()  # Phase -> count, as of the last reap
+        # Counters over the whole session
+        self.spawned = 0
+        self.retired = 0
+        self.peak = 0
+
+    def reset(self):
+        # Empties the list in place (callers keep a reference to it) and returns it
+        if self.release:
+            for entity in self.entities:
+                self.release(entity)
+        self.entities.clear()
+        self.phases.clear()
+        return self.entities
+
+    def spawn(self, entity):
+        entity.lifecycle = SPAWNING
+        self.entities.append(entity)
+        self.spawned += 1
+        self.peak = max(self.peak, len(self.entities))
+        return entity
+
+    def reap(self):
+        # One compacting pass, once per frame: refreshes every entity's phase
+        # and keeps the ones that aren't retired, in order
+        self.phases.clear()
+        kept = []
+        for entity in self.entities:
+            phase = entity.lifecycle = entity.lifecycle_phase()
+            self.phases[phase] += 1
+            if phase != RETIRED:
+                kept.append(entity)
+            elif self.release:
+                self.release(entity)
+        self.retired += len(self.entities) - len(kept)
+        self.entities[:] = kept
+
+    @property
+    def live(self):
+        return len(self.entities)
+
+    @property
+    def total(self):
+        return self.spawned
+
+    def stats(self):
+        return {
+            'live': self.live,
+            'total': self.total,
+            'retired': self.retired,
+            'peak': self.peak,
+            'dying': self.phases[DYING],
+        }
+
+
+# Shared instances for the gameplay entity lists; retired entities go back to
+# their pools (see pool.py)
+enemy_lifecycle = Lifecycle('enemies', release)
+potion_lifecycle = Lifecycle('potions', release)
+grenade_lifecycle = Lifecycle('grenades', release)
+lifecycles = (enemy_lifecycle, potion_lifecycle, grenade_lifecycle)
+
+
+def reap_all():
+    for lifecycle in lifecycles:
+        lifecycle.reap()
+
+
+def format_stats():
+    parts = []
+    for lifecycle in lifecycles:
+        stats = lifecycle.stats()
+        parts.append(f"{lifecycle.name} {stats['live']} live ({stats['dying']} dying, "
+                     f"peak {stats['peak']}) / {stats['total']} total")
+    return "Entities: " + ", ".join(parts)
@@ -1,21 +1,57 @@
-import os
 import pygame
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
-from player import Player
-from enemies import FatGirlEnemy, WolfEnemy
-from spawner import Spawner
-import random
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, DIRTY_RECTS, DEBUG_DIRTY_RECTS, RECORD_REPLAY
+from enemies import preload_fades
 from game_state import GameState
-from hitboxes import get_player_hitbox, get_enemy_hitbox, get_attack_hitbox
-from game_sounds import GameSounds
+from hitboxes import get_player_hitbox, get_attack_hitbox
+from game_sounds import GameSounds, sound_bank, format_stats as format_sound_stats
 from effects import Effects
 from health_potion import HealthPotion
 from mana_potion import ManaPotion
 from milky_grenade import MilkyGrenade
+from asset_registry import registry, format_stats
+from asset_pack import AssetPack
+from asset_manifest import asset_specs
+from asset_loader import load_assets
+from text_cache import get_font, format_stats as format_text_stats
+from alpha_cache import format_stats as format_fade_stats
+from pulse import format_stats as format_pulse_stats
+from hud import add_popup, format_stats as format_hud_stats
+from renderer import DirtyRectRenderer
+from render_queue import render_queue, LAYER_HUD, LAYER_EFFECTS, format_stats as format_queue_stats
+from culling import viewport, format_stats as format_culling_stats
+from combat import combat, grenade_damage, MELEE, GRENADE, ULTIMATE, ULTIMATE_DAMAGE, format_stats as format_combat_stats
+from timestep import timestep, interpolator, format_stats as format_timestep_stats
+from spatial_hash import enemy_index, format_stats as format_collision_stats
+from pool import acquire, format_stats as format_pool_stats
+from lifecycle import enemy_lifecycle, grenade_lifecycle, reap_all, format_stats as format_lifecycle_stats
+from render_scale import world_width, open_display, present
+from replay import rng, input_driver
+from session import reset_session, enemy_swarm
 
-from background import ParallaxBackground
+from background import ParallaxBackground, BACKGROUND_DIR
+
+def print_stats(renderer=None):
+    # Cache statistics, printed on exit to confirm gameplay ran from the caches
+    print(format_stats())
+    print(format_text_stats())
+    print(format_hud_stats())
+    print(format_fade_stats())
+    print(format_pulse_stats())
+    print(format_queue_stats())
+    print(format_culling_stats())
+    print(format_lifecycle_stats())
+    if enemy_swarm is not None:
+        from swarm import format_stats as format_swarm_stats
+        print(format_swarm_stats())
+    print(format_pool_stats())
+    print(format_collision_stats())
+    print(format_combat_stats())
+    print(format_timestep_stats())
+    print(format_sound_stats())
+    if renderer:
+        stats = renderer.stats()
+        print(f"Dirty rects: {stats['frames']} frames, {stats['average_coverage']:.1%} of the screen updated on average")
 
-BACKGROUND_DIR = os.path.join('assets', 'background', 'jungle')
 
 def handle_events(game_state, restart_flag):
     for event in pygame.event.get():
@@ -28,8 +64,12 @@ def handle_events(game_state, restart_flag):
 
 
 def update_game(player, spawner, enemies, kills, game_state, effects, potions, grenades):
-    # Player input and update
-    keys = pygame.key.get_pressed()
+    # enemies, potions and grenades are the lists owned by the shared lifecycle
+    # managers (see lifecycle.py): new entities go through spawn(), and the
+    # retired ones are dropped in one pass at the end of the frame
+    # Player input and update: the key state comes through the input driver,
+    # which records it or plays it back (see replay.py)
+    keys = input_driver.read()
     player.handle_input(keys)
     player.update()
     
@@ -38,7 +78,13 @@ def update_game(player, spawner, enemies, kills, game_state, effects, potions, g
     # Spawn enemies
     new_enemy = spawner.update(player_alive=(player.hp > 0))
     if new_enemy:
-        enemies.append(new_enemy)
+        enemy_lifecycle.spawn(new_enemy)
+
+    # Combat queries go through a grid over the living enemies (see spatial_hash.py),
+    # or straight to the swarm's arrays in swarm mode (see swarm.py)
+    targets = enemy_index if enemy_swarm is None else enemy_swarm
+    enemy_index.begin_frame()
+    enemy_index.rebuild(enemies)
 
     # Handle Ultimate ability effects if active
     if player.ultimate_active:
@@ -77,7 +123,7 @@ def update_game(player, spawner, enemies, kills, game_state, effects, potions, g
             ultimate_range = 0
             if effects.ult_frames[ultimate_direction]:
                 # The last frame (index 3) is the largest and defines the maximum range
-                ultimate_range = effects.ult_frames[ultimate_direction][3].get_width()
+                ultimate_range = world_width(effects.ult_frames[ultimate_direction][3])
                 
             # If unable to get the size, use a default value
             if ultimate_range == 0:
@@ -101,38 +147,29 @@ def update_game(player, spawner, enemies, kills, game_state, effects, potions, g
                     'y_bottom': player_centery + 90
                 }
                 
-            # Use the full effect area (horizontal and vertical) with proper hitbox collision
-            for enemy in enemies:
+            # Use the full effect area (horizontal and vertical) with proper hitbox collision:
+            # enemies whose whole sprite overlaps the hitbox_rect
+            in_area = []
+            if 'hitbox_rect' in ultimate_effect_area:
+                in_area = targets.query_rect(ultimate_effect_area['hitbox_rect'], area='body')
+            for enemy in in_area:
                 if enemy.state != 'dead':
                     # Ensure enemy has width and height attributes
                     enemy_width = getattr(enemy, 'width', 180)  # Default to ENEMY_SIZE[0]
-                    enemy_height = getattr(enemy, 'height', 180)  # Default to ENEMY_SIZE[1]
-                    
-                    # Create a pygame.Rect for the enemy's hitbox
-                    enemy_rect = pygame.Rect(enemy.x, enemy.y, enemy_width, enemy_height)
                     
                     # Check if the enemy is in the correct direction
                     enemy_centerx = enemy.x + (enemy_width // 2)
                     is_to_right = enemy_centerx > player_centerx
                     is_to_left = enemy_centerx < player_centerx
                     
-                    # Only check collision if the enemy is in the correct direction
+                    # Only hit enemies in the correct direction
                     correct_direction = (ultimate_direction == 'right' and is_to_right) or \
                                        (ultimate_direction == 'left' and is_to_left)
                     
-                    # Check for collision using pygame.Rect.colliderect
-                    collision_detected = False
-                    if correct_direction and 'hitbox_rect' in ultimate_effect_area:
-                        # Use the hitbox_rect for collision detection
-                        collision_detected = ultimate_effect_area['hitbox_rect'].colliderect(enemy_rect)
-                        
-                        # Debug information removed
-                    
                     # Check if the enemy is within the effect area
-                    if collision_detected:
+                    if correct_direction:
                         # Ultimate deals significant damage
-                        ultimate_dmg = 50  # Fatal damage for enemies within range
-                        enemy.take_damage(ultimate_dmg)
+                        combat.hit(enemy, ULTIMATE, ULTIMATE_DAMAGE)
                         enemies_hit += 1
                         
                         # We no longer add the milky effect for enemies killed by the ultimate
@@ -147,119 +184,62 @@ def update_game(player, spawner, enemies, kills, game_state, effects, potions, g
     # The first check (when the Ultimate is activated) is already sufficient for the desired effect
     
     # Enemy collisions - player is invulnerable during ultimate
+    # (contact is tested at the positions from before this frame's move)
     player_hitbox = get_player_hitbox(player)
+    touching = targets.query_rect(player_hitbox)
     for enemy in enemies:
-        enemy_hitbox = get_enemy_hitbox(enemy)
         enemy.update(player)
-        if enemy.state != 'dead' and player_hitbox.colliderect(enemy_hitbox):
+    if enemy_swarm is not None:
+        enemy_swarm.update(player.x)
+    for enemy in touching:
+        if enemy.state != 'dead':
             if enemy.dmg_cooldown == 0 and not player.ultimate_active:  # No damage during ultimate
-                dmg = random.randint(enemy.dmg_min, enemy.dmg_max)
+                dmg = rng.randint(enemy.dmg_min, enemy.dmg_max)
                 player.take_damage(dmg)
                 enemy.dmg_cooldown = 30
+    # Enemies moved: index their new positions for the attacks below
+    enemy_index.rebuild(enemies)
 
-    # Player attack
-    min_dmg = 1
-    max_dmg = 5
+    # Player attack: each enemy is hit once per swing
     if player.state == 'attack':
         if not hasattr(player, 'attack_hit_set'):
             player.attack_hit_set = set()
         attack_hitbox = get_attack_hitbox(player)
-        for idx, enemy in enumerate(enemies):
-            enemy_hitbox = get_enemy_hitbox(enemy)
-            if enemy.state != 'dead' and (attack_hitbox.colliderect(enemy_hitbox) or player_hitbox.colliderect(enemy_hitbox)):
-                if idx not in player.attack_hit_set:
-                    dmg = random.randint(min_dmg, max_dmg)
-                    if dmg == max_dmg:
-                        GameSounds.play_milky_effect()
-                        player_centerx = player.x + 90
-                        player_top = player.y
-                        player_position = (player_centerx, player_top)
-                        effects.add_milky_effect(duration=60, player_position=player_position)
-                        critical_dmg = dmg + random.randint(min_dmg, max_dmg)
-                        # Heal the player with the same value as the critical damage
-                        player.heal(critical_dmg)
-                        dmg = critical_dmg
-                    enemy.take_damage(dmg)
-                    player.attack_hit_set.add(idx)
-                    if enemy.hp <= 0:
-                        kills[0] += 1
-                        if enemy.__class__.__name__ == 'WolfEnemy':
-                            player.mana = min(player.max_mana, player.mana + 10)
-                        elif enemy.__class__.__name__ == 'FatGirlEnemy':
-                            player.mana = min(player.max_mana, player.mana + 12)
+        for enemy in targets.query_rects((attack_hitbox, player_hitbox)):
+            if enemy.state != 'dead' and enemy not in player.attack_hit_set:
+                combat.hit(enemy, MELEE)
+                player.attack_hit_set.add(enemy)
     else:
         player.attack_hit_set = set()
         
-    # Check for dead enemies to drop items
-    for enemy in enemies:
-        if enemy.state == 'dead' and enemy.drop_type and not enemy.item_dropped:
-            # Check drop chance
-            if random.random() <= enemy.drop_chance:
-                # Create the appropriate item at the enemy's position
-                drop_x = enemy.x + 70  # Adjust position to the center of the enemy
-                drop_y = enemy.y + 70
-                
-                if enemy.drop_type == 'health_potion':
-                    item = HealthPotion(drop_x, drop_y)
-                    potions.append(item)
-                elif enemy.drop_type == 'mana_potion':
-                    item = ManaPotion(drop_x, drop_y)
-                    potions.append(item)
-                    
-            enemy.item_dropped = True
-            
     # Handle Milky Grenade creation if player has thrown one
     if hasattr(player, 'grenade_thrown') and player.grenade_thrown:
         # Create a new grenade at the player's position
         x, y = player.grenade_position
-        grenade = MilkyGrenade(x, y, player.grenade_direction)
-        grenades.append(grenade)
+        grenade = acquire(MilkyGrenade, x, y, player.grenade_direction)
+        grenade_lifecycle.spawn(grenade)
         
         # Reset the flag
         player.grenade_thrown = False
     
     # Update grenades and check for explosions
-    for grenade in grenades[:]:
+    for grenade in grenades:
         grenade.update()
         
         # If grenade is exploding, check for enemy damage
         if grenade.exploding:
-            explosion_rect = grenade.get_explosion_rect()
-            if explosion_rect:
-                for enemy in enemies:
-                    if enemy.state != 'dead':
-                        # Ensure enemy has width and height attributes
-                        enemy_width = getattr(enemy, 'width', 180)  # Default to ENEMY_SIZE[0]
-                        enemy_height = getattr(enemy, 'height', 180)  # Default to ENEMY_SIZE[1]
-                        
-                        # Create a pygame.Rect for the enemy's hitbox
-                        enemy_rect = pygame.Rect(enemy.x, enemy.y, enemy_width, enemy_height)
-                        if explosion_rect.colliderect(enemy_rect):
-                            # Calculate damage based on distance from explosion center
-                            dx = (enemy.x + enemy_width/2) - (grenade.x)
-                            dy = (enemy.y + enemy_height/2) - (grenade.y)
-                            distance = (dx**2 + dy**2)**0.5
-                            
-                            # Maximum damage at center, decreasing with distance
-                            max_damage = 40
-                            min_damage = 10
-                            damage_factor = max(0, 1 - distance / grenade.explosion_radius)
-                            damage = int(min_damage + damage_factor * (max_damage - min_damage))
-                            
-                            enemy.take_damage(damage)
-                            if enemy.hp <= 0:
-                                kills[0] += 1
-                                if enemy.__class__.__name__ == 'WolfEnemy':
-                                    player.mana = min(player.max_mana, player.mana + 10)
-                                elif enemy.__class__.__name__ == 'FatGirlEnemy':
-                                    player.mana = min(player.max_mana, player.mana + 12)
-        
-        # Remove inactive grenades
-        if not grenade.active:
-            grenades.remove(grenade)
+            # Enemies whose sprite reaches into the blast circle
+            for enemy in targets.query_radius((grenade.x, grenade.y), grenade.explosion_radius):
+                if enemy.state != 'dead':
+                    # Damage based on distance from explosion center
+                    combat.hit(enemy, GRENADE, grenade_damage(grenade, enemy))
+
+    # Apply this frame's ultimate, melee and grenade hits: damage, kills,
+    # mana and drops (see combat.py)
+    combat.resolve(player, effects, kills)
     
     # Update potions and other items
-    for item in potions[:]:  # Use a copy of the list to be able to remove items during iteration
+    for item in potions:
         item.update()
         
         # Check collision with the player
@@ -271,30 +251,43 @@ def update_game(player, spawner, enemies, kills, game_state, effects, potions, g
                 heal_amount = item.collect()
                 player.hp = min(player.max_hp, player.hp + heal_amount)
                 # Add "HEAL" text effect at the potion's position
-                player.damage_popups.append([f"{heal_amount}", item.x, item.y - 30, 255, 0, "heal"])
+                add_popup(player.damage_popups, f"{heal_amount}", item.x, item.y - 30, "heal")
             elif isinstance(item, ManaPotion):
                 # Mana potion
                 mana_amount = item.collect()
                 player.mana = min(player.max_mana, player.mana + mana_amount)
                 # Add "MANA" text effect at the potion's position
-                player.damage_popups.append([f"{mana_amount}", item.x, item.y - 30, 255, 0, "mana"])
-def draw_game(screen, player, enemies, background, effects, potions, grenades, elapsed_time, kills, hud):
-    background.update()
-    background.draw(screen)
+                add_popup(player.damage_popups, f"{mana_amount}", item.x, item.y - 30, "mana")
+
+    # Drop finished corpses, off-screen birds, collected potions and spent grenades
+    reap_all()
+    if enemy_swarm is not None:
+        enemy_swarm.reap()
+
+def draw_game(screen, player, enemies, background, effects, potions, grenades, elapsed_time, kills, hud, renderer=None):
+    # Returns the rects drawn this frame (used by the dirty-rect renderer)
+    if renderer:
+        # Restore the static backdrop under last frame's rects only
+        renderer.begin_frame()
+    else:
+        background.draw(screen)  # Scrolled by the simulation steps
+    # Everything is queued first and drawn by layer (see render_queue.py), so
+    # the submission order below doesn't decide what ends up on top. Off-screen
+    # drawables are culled as they submit (see culling.py).
+    viewport.begin_frame()
     for enemy in enemies:
-        enemy.draw(screen)
-    # Draw potions before the player so the player is on top
+        enemy.draw(render_queue)
+    if enemy_swarm is not None:
+        enemy_swarm.draw(render_queue)
     for potion in potions:
-        potion.draw(screen)
-    
-    # Draw grenades
+        potion.draw(render_queue)
     for grenade in grenades:
-        grenade.draw(screen)
-        
-    player.draw(screen)
-    hud.draw_hud(screen, player, int(elapsed_time), kills)
+        grenade.draw(render_queue)
+    player.draw(render_queue)
+    render_queue.submit_call(LAYER_HUD, hud.draw_hud, player, int(elapsed_time), kills)
     # Draw visual effects on top of everything
-    effects.draw(screen)
+    render_queue.submit_call(LAYER_EFFECTS, effects.draw)
+    return render_queue.flush(screen, collect_rects=renderer is not None)
     
     # DEBUG: Draw the effect area of the ultimate (commented, only for debug)
     # for effect in effects.effects:
@@ -310,73 +303,123 @@ def main(start_playing=False):
     from game_sounds import GameSounds
     pygame.init()
     GameSounds.play_soundtrack()
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    # The display, or a lower-resolution canvas in front of it (settings.RENDER_SCALE)
+    screen = open_display()
     pygame.display.set_caption('Penis Survival')
+    # Use the prebaked asset pack when it has been built (see asset_pack.py).
+    # Opened once per process: a restart runs main() again with it in place.
+    if registry.pack is None:
+        registry.use_pack(AssetPack.open())
+    # Decode everything up front on worker threads, behind a progress screen
+    load_assets(asset_specs(), screen)
+    GameSounds.load_effects()
     clock = pygame.time.Clock()
 
     background = ParallaxBackground(BACKGROUND_DIR)
-    player = Player()
-    enemies = []
-    potions = []  # List to store health potions
-    grenades = []  # List to store active grenades
-    spawner = Spawner()
-    game_state = GameState()
     effects = Effects()  # Initialize the visual effects manager
+    # Player, spawner, entity lists and kills; seeds the session RNG and records its input
+    player, spawner, enemies, potions, grenades, kills = reset_session(effects)
+    game_state = GameState()
+    # Optional dirty-rect renderer (settings.DIRTY_RECTS)
+    renderer = DirtyRectRenderer(screen, background, DEBUG_DIRTY_RECTS) if DIRTY_RECTS else None
+    screen_signature = None  # Last menu/pause/game over screen drawn in dirty-rect mode
+    # Warm everything that is otherwise loaded on first use, before PLAYING starts
+    effects.preload()
+    hud.load_skill_icons()
+    hud.load_popup_atlases()
+    preload_fades()
     if start_playing:
         game_state.set_state(GameState.PLAYING)
     restart_flag = {'restart': False}
     def restart():
         restart_flag['restart'] = True
     game_state.set_restart_callback(restart)
-    font = pygame.font.SysFont(None, 60)
-    kills = [0]
+    font = get_font(None, 60)
     elapsed_time = 0
+    last_state = game_state.state  # To start a new session only on entering the menu
     running = True
+    clock.tick()  # Frame times start here, not at the loading above
 
     while running:
         # --- EVENTS AND STATE ---
         result = handle_events(game_state, restart_flag)
         if result == 'quit':
+            if RECORD_REPLAY:
+                input_driver.save(RECORD_REPLAY)
             game_state.fade_out(screen, background)
+            print_stats(renderer)
             return 'quit'
         if result == 'restart':
             return 'restart'
 
         game_state.update(player)
+        entered_menu = game_state.state == GameState.MENU and last_state != GameState.MENU
+        last_state = game_state.state
 
         # --- MENU/PAUSE/GAME OVER ---
         if not game_state.is_playing():
-            # If returned to menu, reinitialize the game
-            if game_state.state == GameState.MENU:
-                player = Player()
-                enemies = []
-                potions = []  # Reset health potions
-                spawner = Spawner()
-                kills = [0]
+            # If returned to menu, reinitialize the game: once per visit, so
+            # the next session is seeded and recorded exactly once
+            if entered_menu:
+                player, spawner, enemies, potions, grenades, kills = reset_session(effects, player)
                 elapsed_time = 0
-            leave_game = game_state.draw(screen, font, SCREEN_WIDTH, SCREEN_HEIGHT, background)
-            pygame.display.flip()
+            if game_state.state == GameState.PAUSED and game_state.pause_snapshot is None:
+                # The screen still holds the last gameplay frame: freeze it
+                game_state.freeze(screen)
+            leave_game = False
+            if renderer:
+                # Static screens are redrawn, over the frozen backdrop, only when they change
+                signature = game_state.screen_signature()
+                if signature != screen_signature:
+                    leave_game = game_state.draw(screen, font, SCREEN_WIDTH, SCREEN_HEIGHT, renderer.static_background)
+                    renderer.present_full()
+                    screen_signature = signature
+            else:
+                leave_game = game_state.draw(screen, font, SCREEN_WIDTH, SCREEN_HEIGHT, background)
+                present(screen)
             if game_state.state == 'leave_game' or leave_game:
                 game_state.fade_out(screen, background)
+                print_stats(renderer)
                 return 'quit'
             clock.tick(FPS)
             continue
 
         # --- MAIN GAMEPLAY ---
         if game_state.state == GameState.PLAYING:
-            update_game(player, spawner, enemies, kills, game_state, effects, potions, grenades)
-            effects.update()  # Update the visual effects
-            elapsed_time += 1/FPS if FPS else 1/60
-            draw_game(screen, player, enemies, background, effects, potions, grenades, elapsed_time, kills[0], hud)
+            # Fixed-timestep simulation: as many steps as the last frame's real
+            # time calls for (see timestep.py), then a frame drawn between the
+            # last two steps
+            for _ in range(timestep.advance(clock.get_time() / 1000)):
+                interpolator.snapshot((player,), enemies, potions, grenades, swarm=enemy_swarm)
+                update_game(player, spawner, enemies, kills, game_state, effects, potions, grenades)
+                sound_bank.next_frame()
+                effects.update()  # Update the visual effects
+                # Render-side animations also advance per step, not per frame
+                hud.update_skill_icons(player)
+                if not renderer:
+                    background.update()  # Parallax scroll (frozen in dirty-rect mode)
+                elapsed_time += timestep.step
+                if player.hp <= 0:
+                    break
+            interpolator.blend(timestep.alpha)
+            rects = draw_game(screen, player, enemies, background, effects, potions, grenades, elapsed_time, kills[0], hud, renderer)
+            interpolator.restore()
+            screen_signature = None
             # Save kills/time for game over
             if player.hp <= 0 and game_state.state != 'game_over':
                 game_state.last_kills = kills[0]
                 game_state.last_time = int(elapsed_time)
+                if RECORD_REPLAY:
+                    input_driver.save(RECORD_REPLAY)
+            if renderer:
+                renderer.present(rects)
+                clock.tick(FPS)
+                continue
         else:
             # Draw menu, settings, pause, game over, etc
-            game_state.draw(screen, pygame.font.SysFont(None, 60), SCREEN_WIDTH, SCREEN_HEIGHT, background)
+            game_state.draw(screen, font, SCREEN_WIDTH, SCREEN_HEIGHT, background)
 
-        pygame.display.flip()
+        present(screen)
         clock.tick(FPS)
 
     pygame.quit()
@@ -396,3 +439,4 @@ if __name__ == '__main__':
             break
         else:
             break
+    registry.use_pack(None)  # Closes the asset pack's map and file
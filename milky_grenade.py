@@ -1,6 +1,11 @@
 import pygame
 import math
 from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from asset_registry import get_image, get_frames
+from render_scale import world_width, world_height
+from render_queue import LAYER_GRENADES
+from culling import viewport
+from lifecycle import ALIVE, DYING, RETIRED
 
 class MilkyGrenade:
     """
@@ -18,17 +23,37 @@ class MilkyGrenade:
             direction (str): Direction to throw ('left' or 'right')
             initial_velocity (int): Initial velocity of the grenade
         """
+        self.explosion_radius = 250  # Increased radius of explosion for damage
+        self.angle = math.radians(45)  # 45 degrees in radians
+        self.gravity = 0.5
+        self.explosion_time = 60  # Explode after 60 frames (1 second at 60 FPS)
+        self.explosion_duration = 24  # Duration of explosion animation in frames
+        
+        # Animation frames
+        self.grenade_frames = {
+            'left': None,
+            'right': None
+        }
+        self.explosion_frames = []
+        self.load_frames()
+        
+        # Hitbox for collision detection - will be updated after loading frames
+        self.rect = pygame.Rect(x, y, 48, 48)  # Initial size, will be updated
+        self.reset(x, y, direction, initial_velocity)
+        
+    def reset(self, x, y, direction, initial_velocity=20):
+        """
+        Put the grenade back at the start of a throw. Called by __init__ and
+        when a pooled grenade is reused; takes the same arguments.
+        """
         self.x = x
         self.y = y
         self.direction = direction
         self.active = True
         self.exploding = False
-        self.explosion_radius = 250  # Increased radius of explosion for damage
         
         # Physics parameters
         self.initial_velocity = initial_velocity
-        self.angle = math.radians(45)  # 45 degrees in radians
-        self.gravity = 0.5
         self.time = 0
         
         # Calculate initial velocity components
@@ -39,57 +64,20 @@ class MilkyGrenade:
         
         # Timer for explosion
         self.timer = 0
-        self.explosion_time = 60  # Explode after 60 frames (1 second at 60 FPS)
-        self.explosion_duration = 24  # Duration of explosion animation in frames
-        
-        # Animation frames
-        self.grenade_frames = {
-            'left': None,
-            'right': None
-        }
-        self.explosion_frames = []
         self.explosion_index = 0
-        self.load_frames()
-        
-        # Hitbox for collision detection - will be updated after loading frames
-        self.rect = pygame.Rect(self.x, self.y, 48, 48)  # Initial size, will be updated
+        self.rect.update(x, y, 48, 48)
         
     def load_frames(self):
         """Load all animation frames for the grenade and explosion."""
         try:
-            # Load grenade frames and scale them up (1.5x larger)
-            grenade_scale = 1.5
-            left_img = pygame.image.load('assets/effects/grenade/granada_left.png').convert_alpha()
-            right_img = pygame.image.load('assets/effects/grenade/granada_right.png').convert_alpha()
-            
-            # Get original dimensions
-            original_width = left_img.get_width()
-            original_height = left_img.get_height()
-            
-            # Scale up the grenade images
-            self.grenade_frames['left'] = pygame.transform.scale(
-                left_img, 
-                (int(original_width * grenade_scale), int(original_height * grenade_scale))
+            # Grenade frames are 1.5x larger, explosion frames 2x larger.
+            # Surfaces come from the shared asset registry.
+            self.grenade_frames['left'] = get_image('assets/effects/grenade/granada_left.png', scale=1.5)
+            self.grenade_frames['right'] = get_image('assets/effects/grenade/granada_right.png', scale=1.5)
+            self.explosion_frames = get_frames(
+                [f'assets/effects/grenade/explosao_{i}.png' for i in range(1, 5)],  # 4 explosion frames
+                scale=2.0
             )
-            self.grenade_frames['right'] = pygame.transform.scale(
-                right_img, 
-                (int(original_width * grenade_scale), int(original_height * grenade_scale))
-            )
-            
-            # Load explosion frames and scale them up (2x larger)
-            explosion_scale = 2.0
-            for i in range(1, 5):  # 4 explosion frames
-                original_frame = pygame.image.load(f'assets/effects/grenade/explosao_{i}.png').convert_alpha()
-                # Get original dimensions
-                original_width = original_frame.get_width()
-                original_height = original_frame.get_height()
-                
-                # Scale up the explosion images
-                scaled_frame = pygame.transform.scale(
-                    original_frame, 
-                    (int(original_width * explosion_scale), int(original_height * explosion_scale))
-                )
-                self.explosion_frames.append(scaled_frame)
         except Exception as e:
             print(f"Error loading grenade frames: {e}")
     
@@ -122,8 +110,8 @@ class MilkyGrenade:
         
         # Update hitbox with the actual size of the grenade image
         if self.grenade_frames[self.direction]:
-            self.rect.width = self.grenade_frames[self.direction].get_width()
-            self.rect.height = self.grenade_frames[self.direction].get_height()
+            self.rect.width = world_width(self.grenade_frames[self.direction])
+            self.rect.height = world_height(self.grenade_frames[self.direction])
         self.rect.x = int(self.x)
         self.rect.y = int(self.y)
         
@@ -137,8 +125,8 @@ class MilkyGrenade:
         if self.x < -50 or self.x > SCREEN_WIDTH + 50:
             self.active = False
     
-    def draw(self, screen):
-        """Draw the grenade or explosion on the screen."""
+    def draw(self, queue):
+        """Submit the grenade or explosion to the render queue."""
         if not self.active:
             return
             
@@ -148,16 +136,23 @@ class MilkyGrenade:
             explosion_img = self.explosion_frames[explosion_index]
             
             # Center the explosion at the grenade's position
-            explosion_x = self.x - explosion_img.get_width() // 2 + self.rect.width // 2
-            explosion_y = self.y - explosion_img.get_height() // 2 + self.rect.height // 2
+            explosion_x = self.x - world_width(explosion_img) // 2 + self.rect.width // 2
+            explosion_y = self.y - world_height(explosion_img) // 2 + self.rect.height // 2
             
-            screen.blit(explosion_img, (explosion_x, explosion_y))
+            if viewport.visible_at(explosion_img, (explosion_x, explosion_y)):
+                queue.submit(explosion_img, (explosion_x, explosion_y), LAYER_GRENADES)
         else:
             # Draw grenade
             grenade_img = self.grenade_frames[self.direction]
-            if grenade_img:
-                screen.blit(grenade_img, (self.x, self.y))
+            if grenade_img and viewport.visible_at(grenade_img, (self.x, self.y)):
+                queue.submit(grenade_img, (self.x, self.y), LAYER_GRENADES)
     
+    def lifecycle_phase(self):
+        """Flying grenades are alive, exploding ones dying, finished ones retired."""
+        if not self.active:
+            return RETIRED
+        return DYING if self.exploding else ALIVE
+
     def get_explosion_rect(self):
         """Get the rectangle representing the explosion area for damage calculation."""
         if not self.exploding:
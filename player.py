@@ -1,59 +1,30 @@
 import os
 import pygame
 from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from asset_registry import get_frames
+from render_queue import LAYER_PLAYER
+from culling import viewport
 
-def load_player_frames():
+PLAYER_SIZE = (180, 180)
+
+def player_frame_paths():
     # Base directory for player assets
     player_dir = os.path.join('assets', 'player')
-    
-    # Initialize dictionary for all player actions
-    actions = {
-        'walk_right': [],
-        'walk_left': [],
-        'jump': [],
-        'attack_right': [],
-        'attack_left': []
-    }
-    
-    # Load walk animations from walk subfolder
     walk_dir = os.path.join(player_dir, 'walk')
-    for i in range(1, 5):
-        # Load walk right frames
-        path = os.path.join(walk_dir, f'walk_right_{i}.png')
-        img = pygame.image.load(path).convert_alpha()
-        img = pygame.transform.scale(img, (180, 180))
-        actions['walk_right'].append(img)
-        
-        # Load walk left frames
-        path = os.path.join(walk_dir, f'walk_left_{i}.png')
-        img = pygame.image.load(path).convert_alpha()
-        img = pygame.transform.scale(img, (180, 180))
-        actions['walk_left'].append(img)
-    
-    # Load jump animations from jump subfolder
     jump_dir = os.path.join(player_dir, 'jump')
-    for i in range(1, 5):
-        path = os.path.join(jump_dir, f'jump_{i}.png')
-        img = pygame.image.load(path).convert_alpha()
-        img = pygame.transform.scale(img, (180, 180))
-        actions['jump'].append(img)
-    
-    # Load attack animations from base_attack subfolder
     attack_dir = os.path.join(player_dir, 'base_attack')
-    for i in range(1, 5):
-        # Load attack right frames
-        path = os.path.join(attack_dir, f'attack_right_{i}.png')
-        img = pygame.image.load(path).convert_alpha()
-        img = pygame.transform.scale(img, (180, 180))
-        actions['attack_right'].append(img)
-        
-        # Load attack left frames
-        path = os.path.join(attack_dir, f'attack_left_{i}.png')
-        img = pygame.image.load(path).convert_alpha()
-        img = pygame.transform.scale(img, (180, 180))
-        actions['attack_left'].append(img)
     
-    return actions
+    return {
+        'walk_right': [os.path.join(walk_dir, f'walk_right_{i}.png') for i in range(1, 5)],
+        'walk_left': [os.path.join(walk_dir, f'walk_left_{i}.png') for i in range(1, 5)],
+        'jump': [os.path.join(jump_dir, f'jump_{i}.png') for i in range(1, 5)],
+        'attack_right': [os.path.join(attack_dir, f'attack_right_{i}.png') for i in range(1, 5)],
+        'attack_left': [os.path.join(attack_dir, f'attack_left_{i}.png') for i in range(1, 5)]
+    }
+
+def load_player_frames():
+    # All player frames are 180x180 and shared through the asset registry
+    return {action: get_frames(paths, size=PLAYER_SIZE) for action, paths in player_frame_paths().items()}
 
 # --- Player class: manages attributes, input, damage, and drawing ---
 class Player:
@@ -181,7 +152,8 @@ class Player:
         # Centralize above player
         popup_x = self.x + 90
         popup_y = self.y - 30
-        self.damage_popups.append([str(dmg), popup_x, popup_y, 255, 0, "damage"])
+        from hud import add_popup
+        add_popup(self.damage_popups, str(dmg), popup_x, popup_y, "damage")
 
     def heal(self, amount):
         # Ensure amount is a number
@@ -196,7 +168,8 @@ class Player:
             # Add healing popup (similar to damage popup, but in green)
             popup_x = self.x + 90
             popup_y = self.y - 30
-            self.damage_popups.append([str(actual_heal), popup_x, popup_y, 255, 0, "heal"])
+            from hud import add_popup
+            add_popup(self.damage_popups, str(actual_heal), popup_x, popup_y, "heal")
             
     def use_ultimate(self):
         """Activate the player's ultimate ability when mana is full.
@@ -259,7 +232,8 @@ class Player:
         self.grenade_position = (self.x + 90, self.y + 90)  # Center of player
         self.grenade_direction = self.direction
 
-    def draw(self, surface):
+    def draw(self, queue):
+        # Submits the player's draw commands to the render queue
         from hud import draw_damage_popups
         if self.state == 'walk':
             frames = self.frames['walk_right'] if self.direction == 'right' else self.frames['walk_left']
@@ -273,7 +247,8 @@ class Player:
         img = frames[self.anim_index % len(frames)]
         
         # Draw the player normally (without glow effect)
-        surface.blit(img, (self.x, self.y))
+        if viewport.visible_at(img, (self.x, self.y)):
+            queue.submit(img, (self.x, self.y), LAYER_PLAYER)
             
         # Draw player damage popups
-        draw_damage_popups(surface, self.damage_popups)
\ No newline at end of file
+        draw_damage_popups(queue, self.damage_popups)
\ No newline at end of file
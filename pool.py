@@ -0,0 +1,74 @@
+# --- Object pools: released objects are reset and handed out again instead of reallocated ---
+class Pool:
+    def __init__(self, name, factory, reset=None):
+        self.name = name
+        self.factory = factory  # factory(*args) builds a new object
+        # reset(obj, *args) reinitializes a released object; defaults to obj.reset(*args)
+        self.reset = reset
+        self.free = []
+        # Counters: current occupancy and session totals
+        self.in_use = 0
+        self.high_water = 0
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            if self.reset:
+                self.reset(obj, *args, **kwargs)
+            else:
+                obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            self.created += 1
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return obj
+
+    def release(self, obj):
+        # The caller must drop every reference it still uses: obj can be handed
+        # out again on the next acquire
+        self.in_use -= 1
+        self.free.append(obj)
+
+    def stats(self):
+        return {
+            'in_use': self.in_use,
+            'free': len(self.free),
+            'high_water': self.high_water,
+            'created': self.created,
+            'reused': self.reused,
+        }
+
+
+# Shared pools: class -> pool of its instances (created on first acquire),
+# plus named pools for plain data such as the damage popups
+pools = {}
+
+
+def pool_for(cls):
+    pool = pools.get(cls)
+    if pool is None:
+        pool = pools[cls] = Pool(cls.__name__, cls)
+    return pool
+
+
+def acquire(cls, *args, **kwargs):
+    # Pooled cls(*args, **kwargs): the class needs a reset(*args, **kwargs)
+    # that matches its constructor
+    return pool_for(cls).acquire(*args, **kwargs)
+
+
+def release(obj):
+    pools[type(obj)].release(obj)
+
+
+def format_stats():
+    parts = []
+    for pool in pools.values():
+        stats = pool.stats()
+        parts.append(f"{pool.name} {stats['in_use']} in use / {stats['in_use'] + stats['free']} "
+                     f"(high water {stats['high_water']}, {stats['reused']} reused)")
+    return "Pools: " + (", ".join(parts) if parts else "empty")
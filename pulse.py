@@ -0,0 +1,95 @@
+import weakref
+import pygame
+
+
+# --- Pulse cycle: the repeating sequence of scale factors of a pulsating image ---
+class Pulse:
+    def __init__(self, step, limit):
+        # Same motion the effects always used: start at 1.0, add `step` every
+        # frame and reverse once the scale leaves 1.0 +/- `limit`. Worked out
+        # in whole steps so the cycle repeats exactly.
+        self.step = step
+        bound = round(limit / step)
+        offset, direction = 0, 1
+        self.scales = []
+        while True:
+            offset += direction
+            self.scales.append(1.0 + offset * step)
+            if offset > bound or offset < -bound:
+                direction = -direction
+            if offset == 0 and direction == 1:
+                break
+
+    def __len__(self):
+        return len(self.scales)
+
+    def scale(self, phase):
+        return self.scales[phase % len(self.scales)]
+
+
+_pulses = {}
+
+def get_pulse(step, limit):
+    # Pulses are shared by every effect with the same motion
+    key = (abs(step), limit)
+    pulse = _pulses.get(key)
+    if pulse is None:
+        pulse = _pulses[key] = Pulse(abs(step), limit)
+    return pulse
+
+
+# --- Scaled frames of each pulse cycle, built once per source surface and replayed ---
+class PulseFrameCache:
+    def __init__(self):
+        # Source surface -> {pulse: [scaled surface per phase]}
+        self.frames = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def cycle(self, surface, pulse):
+        cycles = self.frames.get(surface)
+        if cycles is None:
+            cycles = self.frames[surface] = {}
+        frames = cycles.get(pulse)
+        if frames is not None:
+            self.hits += 1
+            return frames
+        self.misses += 1
+        by_size = {}  # Phases that round to the same size share one surface
+        frames = []
+        width, height = surface.get_size()
+        for scale in pulse.scales:
+            size = (int(width * scale), int(height * scale))
+            if size not in by_size:
+                by_size[size] = pygame.transform.scale(surface, size)
+            frames.append(by_size[size])
+        cycles[pulse] = frames
+        return frames
+
+    def get(self, surface, pulse, phase):
+        # The frame is shared by every user of this surface and pulse
+        frames = self.cycle(surface, pulse)
+        return frames[phase % len(frames)]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'cycles': sum(len(cycles) for cycles in self.frames.values()),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared instance used by the HUD and the effects
+pulse_frames = PulseFrameCache()
+
+
+def pulse_frame(surface, pulse, phase):
+    return pulse_frames.get(surface, pulse, phase)
+
+
+def format_stats():
+    stats = pulse_frames.stats()
+    return (f"Pulses: {stats['cycles']} cycles prescaled, "
+            f"{stats['hit_rate']:.1%} hit rate ({stats['misses']} built)")
@@ -0,0 +1,95 @@
+from collections import defaultdict
+
+# Draw layers, back to front. Commands in the same layer keep submission order.
+LAYER_ENEMIES = 10
+LAYER_HEALTH_BARS = 15
+LAYER_POTIONS = 20
+LAYER_GRENADES = 30
+LAYER_PLAYER = 40
+LAYER_POPUPS = 50
+LAYER_HUD = 60
+LAYER_EFFECTS = 70
+
+
+# --- Render queue: entities submit draw commands, flushed in layer order with batched blits ---
+class RenderQueue:
+    def __init__(self):
+        # Layer -> list of commands: (surface, position) blits, or
+        # (None, (function, args)) for drawing that isn't a plain blit
+        self.layers = defaultdict(list)
+        # Counters: last frame and totals
+        self.sprites = 0
+        self.draw_calls = 0
+        self.frames = 0
+        self.total_sprites = 0
+        self.total_draw_calls = 0
+
+    def submit(self, surface, position, layer):
+        self.layers[layer].append((surface, position))
+
+    def submit_call(self, layer, function, *args):
+        # function(surface, *args) runs at its place in the layer; it may
+        # return the rect (or list of rects) it drew
+        self.layers[layer].append((None, (function, args)))
+
+    def flush(self, surface, collect_rects=False):
+        # Draws every queued command on `surface` and empties the queue. Runs of
+        # plain blits go out as one Surface.blits/fblits call. Returns the drawn
+        # rects when `collect_rects` is set (for the dirty-rect renderer).
+        rects = []
+        self.sprites = 0
+        self.draw_calls = 0
+        for layer in sorted(self.layers):
+            batch = []
+            for source, position in self.layers[layer]:
+                if source is not None:
+                    batch.append((source, position))
+                    continue
+                self._blit_batch(surface, batch, rects, collect_rects)
+                batch = []
+                function, args = position
+                drawn = function(surface, *args)
+                self.draw_calls += 1
+                if collect_rects and drawn:
+                    if isinstance(drawn, list):
+                        rects.extend(drawn)
+                    else:
+                        rects.append(drawn)
+            self._blit_batch(surface, batch, rects, collect_rects)
+        self.layers.clear()
+        self.frames += 1
+        self.total_sprites += self.sprites
+        self.total_draw_calls += self.draw_calls
+        return rects
+
+    def _blit_batch(self, surface, batch, rects, collect_rects):
+        if not batch:
+            return
+        if collect_rects:
+            rects.extend(surface.blits(batch))
+        elif hasattr(surface, 'fblits'):
+            surface.fblits(batch)
+        else:
+            surface.blits(batch, doreturn=0)
+        self.sprites += len(batch)
+        self.draw_calls += 1
+
+    def clear(self):
+        self.layers.clear()
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'sprites_per_frame': self.total_sprites / self.frames if self.frames else 0.0,
+            'draw_calls_per_frame': self.total_draw_calls / self.frames if self.frames else 0.0,
+        }
+
+
+# Shared instance used by the gameplay draw
+render_queue = RenderQueue()
+
+
+def format_stats():
+    stats = render_queue.stats()
+    return (f"Render queue: {stats['frames']} frames, {stats['sprites_per_frame']:.1f} sprites "
+            f"in {stats['draw_calls_per_frame']:.1f} draw calls per frame")
@@ -0,0 +1,136 @@
+import math
+import pygame
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, RENDER_SCALE
+
+# Internal render resolution. Gameplay (positions, speeds, hitboxes) always
+# works in world units, i.e. SCREEN_WIDTH x SCREEN_HEIGHT; only drawing
+# happens at RENDER_SIZE, and assets are prepared at that size.
+RENDER_SIZE = (round(SCREEN_WIDTH * RENDER_SCALE), round(SCREEN_HEIGHT * RENDER_SCALE))
+SCALE_X = RENDER_SIZE[0] / SCREEN_WIDTH
+SCALE_Y = RENDER_SIZE[1] / SCREEN_HEIGHT
+
+
+def is_scaled():
+    return RENDER_SIZE != (SCREEN_WIDTH, SCREEN_HEIGHT)
+
+
+def to_render_size(size):
+    # World-unit size -> pixels at the render resolution
+    return (max(1, round(size[0] * SCALE_X)), max(1, round(size[1] * SCALE_Y)))
+
+
+def world_size(surface):
+    # Size of a surface prepared at the render resolution, in world units
+    width, height = surface.get_size()
+    return (round(width / SCALE_X), round(height / SCALE_Y))
+
+
+def world_width(surface):
+    return world_size(surface)[0]
+
+
+def world_height(surface):
+    return world_size(surface)[1]
+
+
+def _scale_rect(rect, scale_x, scale_y):
+    # Rounds outwards so the result always covers the original area
+    rect = pygame.Rect(rect)
+    left = math.floor(rect.left * scale_x)
+    top = math.floor(rect.top * scale_y)
+    right = math.ceil(rect.right * scale_x)
+    bottom = math.ceil(rect.bottom * scale_y)
+    return pygame.Rect(left, top, right - left, bottom - top)
+
+
+def to_world_rect(rect):
+    # Pixel rect at the render resolution -> world-unit rect
+    return _scale_rect(rect, 1 / SCALE_X, 1 / SCALE_Y)
+
+
+def render_rect(surface, rect):
+    # World-unit rect -> pixel rect on `surface` (unchanged for the display itself)
+    if isinstance(surface, Canvas):
+        return _scale_rect(rect, SCALE_X, SCALE_Y)
+    return pygame.Rect(rect)
+
+
+def draw_rect(surface, color, rect, width=0, border_radius=0):
+    # pygame.draw.rect for world-unit rects. Returns the drawn rect in world units.
+    if isinstance(surface, Canvas):
+        width = max(1, round(width * SCALE_X)) if width else 0
+        border_radius = round(border_radius * SCALE_X)
+        drawn = pygame.draw.rect(surface, color, render_rect(surface, rect), width, border_radius)
+        return surface.to_world_rect(drawn)
+    return pygame.draw.rect(surface, color, rect, width, border_radius)
+
+
+def make_layer(size):
+    # Transparent off-screen surface of `size` world units, drawn on like the
+    # screen (e.g. a cached HUD panel)
+    if is_scaled():
+        return Canvas(to_render_size(size), pygame.SRCALPHA)
+    return pygame.Surface(size, pygame.SRCALPHA)
+
+
+def present(surface, rects=None):
+    # Shows the frame: flips (or updates `rects` of) the display, copying the
+    # canvas to it first when rendering at a lower resolution
+    if isinstance(surface, Canvas):
+        surface.present(rects)
+    elif rects is None:
+        pygame.display.flip()
+    else:
+        pygame.display.update(rects)
+
+
+# --- Off-screen render target at the internal resolution, addressed in world units ---
+class Canvas(pygame.Surface):
+    # blit(), blits() and fill() take world-unit positions; blit sources are already at
+    # the render resolution (the asset registry and text cache prepare them so).
+    # The display is opened with pygame.SCALED at RENDER_SIZE, so the one
+    # upscale per frame happens in SDL's renderer instead of a software scale.
+    def blit(self, source, dest, area=None, special_flags=0):
+        return self.to_world_rect(super().blit(source, self._to_render_pos(dest), area, special_flags))
+
+    def blits(self, blit_sequence, doreturn=1):
+        # (source, position) pairs, as queued by the render queue
+        rects = super().blits([(source, self._to_render_pos(dest)) for source, dest in blit_sequence], doreturn)
+        return [self.to_world_rect(rect) for rect in rects] if doreturn else None
+
+    if hasattr(pygame.Surface, 'fblits'):  # Newer pygame only
+        def fblits(self, blit_sequence, special_flags=0):
+            super().fblits([(source, self._to_render_pos(dest)) for source, dest in blit_sequence], special_flags)
+
+    def _to_render_pos(self, dest):
+        if isinstance(dest, pygame.Rect):
+            dest = dest.topleft
+        return (math.floor(dest[0] * SCALE_X), math.floor(dest[1] * SCALE_Y))
+
+    def fill(self, color, rect=None, special_flags=0):
+        if rect is not None:
+            rect = render_rect(self, rect)
+        return self.to_world_rect(super().fill(color, rect, special_flags))
+
+    def to_world_rect(self, rect):
+        return to_world_rect(rect)
+
+    def present(self, rects=None):
+        display = pygame.display.get_surface()
+        if rects is None:
+            display.blit(self, (0, 0))
+            pygame.display.flip()
+            return
+        rects = [render_rect(self, rect) for rect in rects]
+        for rect in rects:
+            display.blit(self, rect, rect)
+        pygame.display.update(rects)
+
+
+def open_display():
+    # Returns the surface the game draws on: the display itself at full
+    # resolution, or a Canvas in front of a pygame.SCALED display
+    if not is_scaled():
+        return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    display = pygame.display.set_mode(RENDER_SIZE, pygame.SCALED)
+    return Canvas(RENDER_SIZE, 0, display)
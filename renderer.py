@@ -0,0 +1,104 @@
+import pygame
+from text_cache import render_text
+from render_scale import world_size, world_height, render_rect, draw_rect, present
+
+DIRTY_OUTLINE_COLOR = (255, 0, 255)
+
+
+def union_rects(rects):
+    # Bounding rect of every non-empty rect in `rects`, or None
+    rects = [rect for rect in rects if rect]
+    if not rects:
+        return None
+    return rects[0].unionall(rects[1:])
+
+
+# --- Background stand-in that always draws the same cached backdrop ---
+class StaticBackdrop:
+    def __init__(self, surface):
+        self.surface = surface
+
+    def update(self):
+        pass
+
+    def draw(self, surface):
+        surface.blit(self.surface, (0, 0))
+
+
+# --- Dirty-rectangle renderer: only the regions that changed reach the display ---
+class DirtyRectRenderer:
+    # Static content (the frozen parallax background) lives in a cached
+    # backdrop. Every frame the regions drawn last frame are restored from the
+    # backdrop, the scene is drawn, and the display update receives the
+    # union of last frame's and this frame's rects. Rects are in world units.
+    def __init__(self, screen, background, debug=False):
+        self.screen = screen
+        self.debug = debug
+        self.backdrop = pygame.Surface(screen.get_size()).convert()
+        background.draw(self.backdrop)
+        self.static_background = StaticBackdrop(self.backdrop)
+        self.screen_rect = pygame.Rect((0, 0), world_size(screen))  # Rects are in world units
+        self.previous = []
+        self.full_redraw = True
+        # Stats
+        self.frames = 0
+        self.updated_area = 0
+        self.last_rects = 0
+        self.last_coverage = 0.0
+
+    def invalidate(self):
+        # Next frame restores and updates the whole screen (state changes, menus)
+        self.full_redraw = True
+
+    def begin_frame(self):
+        if self.full_redraw:
+            self.screen.blit(self.backdrop, (0, 0))
+        else:
+            for rect in self.previous:
+                self.screen.blit(self.backdrop, rect, render_rect(self.screen, rect))
+
+    def present(self, rects):
+        # Sends this frame's dirty regions (plus last frame's, which now show
+        # backdrop again) to the display
+        current = [self.screen_rect.clip(rect) for rect in rects if rect]
+        current = [rect for rect in current if rect.width and rect.height]
+        if self.debug:
+            current.extend(self._draw_debug_overlay(current))
+        if self.full_redraw:
+            updates = [self.screen_rect]
+            self.full_redraw = False
+        else:
+            updates = self.previous + current
+        present(self.screen, updates)
+        self.previous = current
+        self._record(updates)
+
+    def present_full(self):
+        # Whole-screen update for frames drawn without rect tracking
+        present(self.screen, [self.screen_rect])
+        self.previous = []
+        self.full_redraw = True
+        self._record([self.screen_rect])
+
+    def _record(self, updates):
+        area = sum(rect.width * rect.height for rect in updates)
+        self.frames += 1
+        self.updated_area += area
+        self.last_rects = len(updates)
+        self.last_coverage = area / (self.screen_rect.width * self.screen_rect.height)
+
+    def _draw_debug_overlay(self, rects):
+        # Outlines every dirty region and shows how much of the screen is updated
+        for rect in rects:
+            draw_rect(self.screen, DIRTY_OUTLINE_COLOR, rect, 1)
+        label = render_text(f"dirty: {self.last_rects} rects, {self.last_coverage:.1%} of screen",
+                            24, DIRTY_OUTLINE_COLOR)
+        label_rect = self.screen.blit(label, (10, self.screen_rect.height - world_height(label) - 10))
+        return [label_rect]
+
+    def stats(self):
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        return {
+            'frames': self.frames,
+            'average_coverage': self.updated_area / (self.frames * screen_area) if self.frames else 0.0,
+        }
@@ -0,0 +1,158 @@
+"""
+Deterministic sessions and input replays.
+
+Every gameplay roll (spawns, contact damage, critical hits, drops) comes from
+one RNG that is seeded when a session starts, and update_game reads its key
+state through the input driver below instead of pygame.key.get_pressed(). The
+driver records the keys the player uses, once per simulation step, so the
+seed plus that recording reproduce the session exactly:
+
+    python headless.py --replay replay.bin
+
+Set settings.RECORD_REPLAY to a path to save each session's recording there
+when it ends.
+"""
+import os
+import struct
+import sys
+import random
+from array import array
+import pygame
+
+# The keys Player.handle_input reads, one bit each in a recorded input state
+RECORDED_KEYS = (
+    pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d, pygame.K_UP, pygame.K_w,
+    pygame.K_SPACE, pygame.K_x, pygame.K_q,
+)
+KEY_BITS = {key: 1 << bit for bit, key in enumerate(RECORDED_KEYS)}
+
+MAGIC = b'PSVRPLY1'
+HEADER = struct.Struct('<8sQI')  # magic, seed, number of runs
+
+# Session RNG: seeded by InputDriver.begin_session() / play()
+rng = random.Random()
+
+
+def new_seed():
+    return int.from_bytes(os.urandom(8), 'little')
+
+
+def key_mask(keys):
+    # Packs the recorded keys of a get_pressed() result into a bit mask
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+class KeyState:
+    # Stand-in for pygame.key.get_pressed() during playback; keys that aren't
+    # recorded read as released
+    __slots__ = ('mask',)
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & KEY_BITS.get(key, 0))
+
+
+RELEASED = KeyState(0)
+
+
+class Recording:
+    # A session's seed plus its input for every simulation step, run-length
+    # encoded: keys are held for many steps, so a long session takes a few KB
+    def __init__(self, seed):
+        self.seed = seed
+        self.masks = array('H')  # Key mask of each run
+        self.counts = array('I')  # Steps in each run
+
+    def append(self, mask):
+        if self.masks and self.masks[-1] == mask:
+            self.counts[-1] += 1
+        else:
+            self.masks.append(mask)
+            self.counts.append(1)
+
+    @property
+    def steps(self):
+        return sum(self.counts)
+
+    def states(self):
+        # Key state of each step, in order
+        for mask, count in zip(self.masks, self.counts):
+            state = KeyState(mask)
+            for _ in range(count):
+                yield state
+
+    def save(self, path):
+        masks, counts = array('H', self.masks), array('I', self.counts)
+        if sys.byteorder == 'big':  # The file is little-endian
+            masks.byteswap()
+            counts.byteswap()
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.seed, len(masks)))
+            f.write(masks.tobytes())
+            f.write(counts.tobytes())
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, seed, runs = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an input replay")
+        recording = Recording(seed)
+        start = HEADER.size
+        recording.masks.frombytes(data[start:start + runs * recording.masks.itemsize])
+        start += runs * recording.masks.itemsize
+        recording.counts.frombytes(data[start:start + runs * recording.counts.itemsize])
+        if sys.byteorder == 'big':
+            recording.masks.byteswap()
+            recording.counts.byteswap()
+        return recording
+
+
+# --- Input driver: the key state update_game sees, live (and recorded) or played back ---
+class InputDriver:
+    def __init__(self):
+        self.seed = None
+        self.recording = None  # Live input of the current session
+        self.playback = None  # Key states left to play back
+
+    def begin_session(self, seed=None):
+        # Seeds the session RNG and starts recording live input
+        self.seed = new_seed() if seed is None else seed
+        rng.seed(self.seed)
+        self.recording = Recording(self.seed)
+        self.playback = None
+
+    def play(self, recording):
+        # Replays `recording` from its first step, with its seed
+        self.seed = recording.seed
+        rng.seed(self.seed)
+        self.recording = None
+        self.playback = recording.states()
+
+    def read(self):
+        # Key state for this simulation step; all keys are released once a
+        # playback runs out
+        if self.playback is not None:
+            return next(self.playback, RELEASED)
+        keys = pygame.key.get_pressed()
+        if self.recording is not None:
+            self.recording.append(key_mask(keys))
+        return keys
+
+    def save(self, path):
+        # Saves the current session's recording, if it has any steps
+        if self.recording is not None and self.recording.masks:
+            self.recording.save(path)
+            return True
+        return False
+
+
+# Shared instance read by update_game
+input_driver = InputDriver()
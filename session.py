@@ -0,0 +1,35 @@
+from settings import SWARM_MODE
+from player import Player
+from spawner import Spawner
+from hud import release_popups
+from lifecycle import enemy_lifecycle, potion_lifecycle, grenade_lifecycle
+from timestep import timestep
+from replay import input_driver
+
+if SWARM_MODE:
+    # Enemies live in the swarm's arrays; numpy is only needed in this mode
+    from swarm import enemy_swarm
+else:
+    enemy_swarm = None
+
+
+def reset_session(effects, player=None, seed=None, recording=None):
+    # Starts a game session from scratch: a new player and spawner, empty
+    # enemy, potion and grenade lists (and swarm), no leftover effects (the
+    # ultimate reads its hit area from them) and a reset timestep. The session
+    # RNG is seeded, or `recording` is played back with its own seed.
+    # The game and the headless runner both start sessions here, so a
+    # recorded session replays exactly.
+    # Returns (player, spawner, enemies, potions, grenades, kills).
+    if player is not None:
+        release_popups(player.damage_popups)
+    if enemy_swarm is not None:
+        enemy_swarm.clear()
+    effects.effects.clear()
+    timestep.reset()
+    if recording is not None:
+        input_driver.play(recording)
+    else:
+        input_driver.begin_session(seed)
+    return (Player(), Spawner(enemy_swarm), enemy_lifecycle.reset(), potion_lifecycle.reset(),
+            grenade_lifecycle.reset(), [0])
@@ -1,3 +1,32 @@
 SCREEN_WIDTH = 1920
 SCREEN_HEIGHT = 1080
-FPS = 60
\ No newline at end of file
+FPS = 60
+# Internal render resolution as a fraction of SCREEN_WIDTH x SCREEN_HEIGHT
+# (e.g. 0.5 draws at 960x540 and lets SDL upscale). Gameplay and hitboxes stay
+# in SCREEN_WIDTH x SCREEN_HEIGHT world units. Build the asset pack for the
+# matching resolution (python asset_pack.py --resolution 960x540).
+RENDER_SCALE = 1.0
+# Audio mixer presets: frequency (Hz), sample size (negative = signed), output
+# channels and buffer size in samples. The buffer is the main source of latency:
+# 256 samples at 44.1 kHz is about 6 ms, the default 1024 about 23 ms.
+AUDIO_PRESETS = {
+    'default': {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 1024},
+    'low_latency': {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 256},
+}
+AUDIO_PRESET = 'low_latency'
+# Dirty-rectangle rendering: only regions that changed are sent to the display
+# (the parallax background is frozen into a static backdrop while enabled).
+# The debug flag outlines the dirty regions and shows the share of the screen updated.
+DIRTY_RECTS = False
+DEBUG_DIRTY_RECTS = False
+# Fixed-timestep simulation: the game advances in steps of 1/FPS seconds and
+# renders in between them. After a long frame it catches up with at most this
+# many steps; time beyond that is dropped and the game slows down instead.
+MAX_SIMULATION_STEPS = 5
+# Swarm mode for horde events: enemies are rows of NumPy arrays (swarm.py),
+# updated in bulk, instead of one Enemy object each. Needs numpy.
+SWARM_MODE = False
+# Input replays: when set to a path, each session's seed and per-step input are
+# saved there when it ends (game over or quit), to be played back with
+# python headless.py --replay <path>
+RECORD_REPLAY = None
@@ -0,0 +1,161 @@
+from collections import defaultdict
+import pygame
+from hitboxes import ENEMY_HITBOX_OFFSET, ENEMY_HITBOX_SIZE
+
+CELL_SIZE = 256  # World units; must be at least the size of an enemy sprite
+
+
+# --- Spatial hash: uniform grid over the living enemies, for combat queries ---
+class SpatialHash:
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        # (column, row) of an enemy's top-left corner -> item indices. Sprites
+        # are no larger than a cell, so an enemy only reaches into the cells
+        # right and below of its own.
+        self.cells = defaultdict(list)
+        self.items = []
+        # Per item, reused between queries: the body hitbox (hitboxes.get_enemy_hitbox)
+        # and the whole sprite area. Only filled in for broad phase candidates.
+        self.hitboxes = []
+        self.bodies = []
+        # Scratch objects reused by every query: the query area, the broad
+        # phase candidates and the rects handed to collidelistall. A query only
+        # allocates its result lists.
+        self.area = pygame.Rect(0, 0, 0, 0)
+        self.found = []
+        self.narrow = []
+        # Counters: queries, broad phase candidates and narrow phase hits
+        self.frames = 0
+        self.queries = 0
+        self.candidates = 0
+        self.hits = 0
+
+    def rebuild(self, enemies):
+        # Indexes the living enemies at their current positions, in list order
+        for cell in self.cells.values():
+            cell.clear()
+        cells = self.cells
+        size = self.cell_size
+        items = self.items
+        items.clear()
+        for enemy in enemies:
+            if enemy.state != 'dead':
+                cells[(int(enemy.x) // size, int(enemy.y) // size)].append(len(items))
+                items.append(enemy)
+        while len(self.bodies) < len(items):
+            self.hitboxes.append(pygame.Rect(0, 0, 0, 0))
+            self.bodies.append(pygame.Rect(0, 0, 0, 0))
+
+    def begin_frame(self):
+        self.frames += 1
+
+    def _candidates(self, rect):
+        # Cells under `rect`, plus one column to the left and one row above
+        # for the enemies that start there and stick out into it
+        size = self.cell_size
+        found = self.found
+        found.clear()
+        for column in range(rect.left // size - 1, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size - 1, (rect.bottom - 1) // size + 1):
+                indices = self.cells.get((column, row))
+                if indices:
+                    found.extend(indices)
+        found.sort()
+        return found
+
+    def _place(self, candidates, area):
+        # Moves the candidates' reusable rects to their hitbox ('hitbox') or
+        # whole sprite ('body'); returns the rect list indexed by item
+        if area == 'hitbox':
+            rects = self.hitboxes
+            dx, dy = ENEMY_HITBOX_OFFSET
+            for index in candidates:
+                enemy = self.items[index]
+                rects[index].update(enemy.x + dx, enemy.y + dy, *ENEMY_HITBOX_SIZE)
+        else:
+            rects = self.bodies
+            for index in candidates:
+                enemy = self.items[index]
+                rects[index].update(enemy.x, enemy.y, getattr(enemy, 'width', 180), getattr(enemy, 'height', 180))
+        return rects
+
+    def _query(self, rect, area):
+        # Broad phase over the grid cells, narrow phase with collidelistall;
+        # returns item indices in list order
+        self.area.update(rect)
+        candidates = self._candidates(self.area)
+        rects = self._place(candidates, area)
+        narrow = self.narrow
+        narrow.clear()
+        narrow.extend(rects[index] for index in candidates)
+        hits = self.area.collidelistall(narrow)
+        self.queries += 1
+        self.candidates += len(candidates)
+        return [candidates[hit] for hit in hits]
+
+    def query_rect(self, rect, area='hitbox'):
+        # Living enemies whose hitbox (or whole sprite, area='body') overlaps
+        # `rect`, in list order
+        indices = self._query(rect, area)
+        self.hits += len(indices)
+        return [self.items[index] for index in indices]
+
+    def query_rects(self, rects, area='hitbox'):
+        # Living enemies overlapping any of `rects`, each once, in list order
+        indices = set()
+        for rect in rects:
+            indices.update(self._query(rect, area))
+        self.hits += len(indices)
+        return [self.items[index] for index in sorted(indices)]
+
+    def query_radius(self, center, radius, area='body'):
+        # Living enemies whose whole sprite (or hitbox, area='hitbox') comes
+        # within `radius` of `center`, in list order. Broad phase: the cells
+        # whose enemies can reach the circle (a cell's enemies cover it and
+        # stick out into the next one right and below); narrow phase: the
+        # distance from the center to each candidate's rect.
+        cx, cy = center
+        size = self.cell_size
+        reach = radius * radius
+        found = self.found
+        found.clear()
+        for column in range(int((cx - radius) // size) - 1, int((cx + radius) // size) + 1):
+            dx = max(column * size - cx, 0, cx - (column + 2) * size)
+            for row in range(int((cy - radius) // size) - 1, int((cy + radius) // size) + 1):
+                dy = max(row * size - cy, 0, cy - (row + 2) * size)
+                if dx * dx + dy * dy <= reach:
+                    indices = self.cells.get((column, row))
+                    if indices:
+                        found.extend(indices)
+        found.sort()
+        rects = self._place(found, area)
+        result = []
+        for index in found:
+            rect = rects[index]
+            dx = max(rect.left - cx, 0, cx - rect.right)
+            dy = max(rect.top - cy, 0, cy - rect.bottom)
+            if dx * dx + dy * dy <= reach:
+                result.append(self.items[index])
+        self.queries += 1
+        self.candidates += len(found)
+        self.hits += len(result)
+        return result
+
+    def stats(self):
+        queries = self.queries or 1
+        frames = self.frames or 1
+        return {
+            'queries_per_frame': self.queries / frames,
+            'candidates_per_query': self.candidates / queries,
+            'hits_per_query': self.hits / queries,
+        }
+
+
+# Shared instance for the enemies in update_game
+enemy_index = SpatialHash()
+
+
+def format_stats():
+    stats = enemy_index.stats()
+    return (f"Collisions: {stats['queries_per_frame']:.1f} queries per frame, "
+            f"{stats['candidates_per_query']:.1f} candidates and {stats['hits_per_query']:.2f} hits per query")
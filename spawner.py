@@ -1,9 +1,11 @@
-import random
 from enemies import FatGirlEnemy, WolfEnemy, BlueBirdEnemy, RedBirdEnemy
 from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from pool import acquire
+from replay import rng
 
 class Spawner:
-    def __init__(self):
+    def __init__(self, swarm=None):
+        self.swarm = swarm  # Swarm mode: new enemies become rows of this swarm.Swarm
         self.spawn_timer = 0
         self.difficulty_timer = 0
         self.difficulty = 1
@@ -20,32 +22,39 @@ class Spawner:
             self.difficulty_timer = 0
         if player_alive and self.spawn_timer > max(30, 120 - self.difficulty*10):
             self.spawn_timer = 0
-            side = random.choice(['left', 'right'])
+            side = rng.choice(['left', 'right'])
             x = 0 if side == 'left' else SCREEN_WIDTH-180
             direction = 'right' if side == 'left' else 'left'
-            enemy_type = random.choices(['blue_bird', 'red_bird', 'wolf', 'fatgirl'], weights=[1,1,1,1])[0]
+            enemy_type = rng.choices(['blue_bird', 'red_bird', 'wolf', 'fatgirl'], weights=[1,1,1,1])[0]
             if enemy_type == 'blue_bird':
-                y = random.randint(180, 250)
+                enemy_class = BlueBirdEnemy
+                y = rng.randint(180, 250)
                 speed = 7 + self.difficulty//2
                 dmg_min = 2 + self.difficulty//2
                 dmg_max = 6 + self.difficulty//2
-                new_enemy = BlueBirdEnemy(x, y, direction, speed=speed, dmg_min=dmg_min, dmg_max=dmg_max)
             elif enemy_type == 'red_bird':
-                y = random.randint(180, 250)
+                enemy_class = RedBirdEnemy
+                y = rng.randint(180, 250)
                 speed = 7 + self.difficulty//2
                 dmg_min = 2 + self.difficulty//2
                 dmg_max = 6 + self.difficulty//2
-                new_enemy = RedBirdEnemy(x, y, direction, speed=speed, dmg_min=dmg_min, dmg_max=dmg_max)
             elif enemy_type == 'wolf':
+                enemy_class = WolfEnemy
+                y = SCREEN_HEIGHT-250
                 speed = 6 + self.difficulty//2
                 dmg_min = 1 + self.difficulty//2
                 dmg_max = 7 + self.difficulty//2
-                new_enemy = WolfEnemy(x, SCREEN_HEIGHT-250, direction, speed=speed, dmg_min=dmg_min, dmg_max=dmg_max)
             else:
+                enemy_class = FatGirlEnemy
+                y = SCREEN_HEIGHT-250
                 speed = 3 + self.difficulty//3
                 dmg_min = 3 + self.difficulty//2
                 dmg_max = 11 + self.difficulty//2
-                new_enemy = FatGirlEnemy(x, SCREEN_HEIGHT-250, direction, speed=speed, dmg_min=dmg_min, dmg_max=dmg_max)
+            if self.swarm is not None:
+                # Swarm mode: nothing to return, the enemy is a row of the swarm
+                self.swarm.spawn_enemy(enemy_class, x, y, direction, speed, dmg_min, dmg_max)
+            else:
+                new_enemy = acquire(enemy_class, x, y, direction, speed=speed, dmg_min=dmg_min, dmg_max=dmg_max)
         return new_enemy
 
     def reset(self):
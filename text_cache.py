@@ -0,0 +1,95 @@
+from collections import OrderedDict
+import pygame
+from settings import RENDER_SCALE
+
+
+# --- Small LRU map with hit/miss counters ---
+class LRUCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        value = self.items.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.items.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        if len(self.items) > self.max_size:
+            self.items.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.items),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        self.items.clear()
+
+
+# --- Text cache: font objects and rendered strings are built once and reused ---
+class TextCache:
+    def __init__(self, max_fonts=32, max_texts=512, scale=RENDER_SCALE):
+        # Sizes are given in world units; fonts are opened at the render scale
+        self.scale = scale
+        self.fonts = LRUCache(max_fonts)  # (name, size, bold) -> Font
+        self.texts = LRUCache(max_texts)  # (name, size, bold, text, color, antialias) -> Surface
+
+    def font(self, name, size, bold=False):
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, max(1, round(size * self.scale)), bold=bold)
+            self.fonts.put(key, font)
+        return font
+
+    def render(self, text, size, color, name=None, bold=False, antialias=True):
+        # Returns a shared surface; don't draw on it. Callers that change its
+        # alpha must set it before every blit.
+        key = (name, size, bold, text, color, antialias)
+        surface = self.texts.get(key)
+        if surface is None:
+            surface = self.font(name, size, bold).render(text, antialias, color)
+            self.texts.put(key, surface)
+        return surface
+
+    def stats(self):
+        return {'fonts': self.fonts.stats(), 'texts': self.texts.stats()}
+
+    def clear(self):
+        self.fonts.clear()
+        self.texts.clear()
+
+
+# Shared instance used by the HUD, menus and effects
+text_cache = TextCache()
+
+
+def get_font(name, size, bold=False):
+    return text_cache.font(name, size, bold)
+
+
+def render_text(text, size, color, name=None, bold=False, antialias=True):
+    return text_cache.render(text, size, color, name, bold, antialias)
+
+
+def format_stats():
+    stats = text_cache.stats()
+    return (f"Text: fonts {stats['fonts']['hit_rate']:.1%} hit rate, "
+            f"strings {stats['texts']['entries']} cached, {stats['texts']['hit_rate']:.1%} hit rate, "
+            f"{stats['texts']['evictions']} evictions")
@@ -0,0 +1,128 @@
+from settings import FPS, MAX_SIMULATION_STEPS
+
+
+# --- Fixed timestep: the simulation advances in steps of 1/FPS, whatever the frame time ---
+class FixedTimestep:
+    def __init__(self, step=1 / FPS, max_steps=MAX_SIMULATION_STEPS):
+        self.step = step  # Seconds per simulation step; the game is tuned per step
+        self.max_steps = max_steps  # Cap per frame, so a slow frame can't snowball
+        self.accumulator = 0.0
+        # Counters over the session
+        self.frames = 0
+        self.steps = 0
+        self.dropped = 0.0  # Seconds thrown away by the cap
+
+    def advance(self, frame_time):
+        # Adds the real time of the last frame; returns how many steps to simulate
+        self.accumulator += frame_time
+        limit = self.max_steps * self.step
+        if self.accumulator > limit:
+            self.dropped += self.accumulator - limit
+            self.accumulator = limit
+        steps = int(self.accumulator / self.step)
+        self.accumulator -= steps * self.step
+        self.frames += 1
+        self.steps += steps
+        return steps
+
+    @property
+    def alpha(self):
+        # How far the current frame is between the last two steps (0..1)
+        return min(1.0, self.accumulator / self.step)
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'steps_per_frame': self.steps / self.frames if self.frames else 0.0,
+            'dropped': self.dropped,
+        }
+
+
+# --- Render interpolation: entities are drawn between their last two simulated positions ---
+class Interpolator:
+    def __init__(self):
+        self.previous = {}  # Entity -> (x, y) before the last step
+        self.current = []  # (entity, x, y) swapped out while drawing
+        # Swarm mode (see swarm.py): the rows' uids and positions before the
+        # last step, and their simulated positions while drawing. Buffers are
+        # reused and grown with the swarm, so numpy isn't needed here.
+        self.swarm = None
+        self.swarm_count = 0
+        self.swarm_uid = None
+        self.swarm_x = None
+        self.swarm_y = None
+        self.swarm_drawn_x = None
+        self.swarm_drawn_y = None
+        self.swarm_blended = 0  # Rows moved by blend(), put back by restore()
+
+    def snapshot(self, *groups, swarm=None):
+        # Called before each step. Entities spawned during the step aren't in
+        # here, so they're drawn where they are.
+        self.previous = {entity: (entity.x, entity.y) for group in groups for entity in group}
+        self.swarm = swarm
+        if swarm is not None:
+            if self.swarm_uid is None or len(self.swarm_uid) < swarm.capacity:
+                self.swarm_uid = swarm.uid.copy()
+                self.swarm_x, self.swarm_y = swarm.x.copy(), swarm.y.copy()
+                self.swarm_drawn_x, self.swarm_drawn_y = swarm.x.copy(), swarm.y.copy()
+            n = self.swarm_count = swarm.count
+            self.swarm_uid[:n] = swarm.uid[:n]
+            self.swarm_x[:n] = swarm.x[:n]
+            self.swarm_y[:n] = swarm.y[:n]
+
+    def blend(self, alpha):
+        # Moves every entity to its interpolated position for drawing
+        for entity, (x, y) in self.previous.items():
+            self.current.append((entity, entity.x, entity.y))
+            entity.x = x + (entity.x - x) * alpha
+            entity.y = y + (entity.y - y) * alpha
+        if self.swarm is not None:
+            self._blend_swarm(alpha)
+
+    def _blend_swarm(self, alpha):
+        # Rows keep ascending uids (spawns append, reaps keep the order), so
+        # each row finds its previous position with one searchsorted; rows
+        # spawned during the step have none and stay where they are
+        swarm = self.swarm
+        n, m = swarm.count, self.swarm_count
+        self.swarm_blended = 0
+        if not n or not m:
+            return
+        if len(self.swarm_drawn_x) < n:  # Grew during the step
+            self.swarm_drawn_x, self.swarm_drawn_y = swarm.x.copy(), swarm.y.copy()
+        self.swarm_drawn_x[:n] = swarm.x[:n]
+        self.swarm_drawn_y[:n] = swarm.y[:n]
+        self.swarm_blended = n
+        uid = swarm.uid[:n]
+        rows = self.swarm_uid[:m].searchsorted(uid).clip(0, m - 1)
+        matched = self.swarm_uid[rows] == uid
+        rows = rows[matched]
+        for current, previous in ((swarm.x, self.swarm_x), (swarm.y, self.swarm_y)):
+            before = previous[rows]
+            current[:n][matched] = before + (current[:n][matched] - before) * alpha
+
+    def restore(self):
+        # Puts the simulated positions back after drawing
+        for entity, x, y in self.current:
+            entity.x = x
+            entity.y = y
+        self.current.clear()
+        if self.swarm_blended:
+            n = self.swarm_blended
+            self.swarm.x[:n] = self.swarm_drawn_x[:n]
+            self.swarm.y[:n] = self.swarm_drawn_y[:n]
+            self.swarm_blended = 0
+
+
+# Shared instances for the main loop
+timestep = FixedTimestep()
+interpolator = Interpolator()
+
+
+def format_stats():
+    stats = timestep.stats()
+    return (f"Timestep: {stats['steps_per_frame']:.2f} simulation steps per frame over "
+            f"{stats['frames']} frames, {stats['dropped']:.2f} s dropped by the step cap")